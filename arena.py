@@ -3,15 +3,22 @@ Handles the board / bench state inside of the game and
 other variables used by the bot to make decisions
 """
 
-from time import sleep
+from typing import Callable
+from clock import sleep
+import augment_matcher
+import frame
 import game_assets
 import mk_functions
 import screen_coords
 from champion import Champion
+from item_planner import ItemPlanner, Placement
+from shop_engine import ShopEngine
 import comps
 import ocr
 import game_functions
 import arena_functions
+import telemetry
+import wait
 
 
 class Arena:
@@ -29,14 +36,18 @@ class Arena:
         self.champs_to_buy: dict = comps.champions_to_buy()
         self.board_names: list = []
         self.items: list = []
+        self.item_planner = ItemPlanner(comps.COMP)
+        self.shop_engine = ShopEngine(comps.COMP)
         self.final_comp = False
         self.level = 0
         self.augment_roll = True
         self.spam_roll = False
 
-    def fix_bench_state(self) -> None:
-        """Iterates through bench and fixes invalid slots"""
-        bench_occupied: list = arena_functions.bench_occupied_check()
+    @telemetry.traced()
+    def fix_bench_state(self, bench_occupied: list | None = None) -> None:
+        """Iterates through bench and fixes invalid slots, an occupancy read that was already taken can be passed in"""
+        if bench_occupied is None:
+            bench_occupied = arena_functions.bench_occupied_check()
         for index, slot in enumerate(self.bench):
             if slot is None and bench_occupied[index]:
                 mk_functions.right_click(screen_coords.BENCH_LOC[index].get_coords())
@@ -73,6 +84,34 @@ class Arena:
             if isinstance(slot, Champion) and not bench_occupied[index]:
                 self.bench[index] = None
 
+    def expected_bench_occupancy(self) -> list[bool]:
+        """Which bench slots should be occupied given the purchases, sales and moves the bot has made"""
+        return [slot is not None for slot in self.bench]
+
+    def verify_bench_state(self, timeout: float = 0, merging: tuple[int, ...] = ()) -> None:
+        """Checks the bench against the expected occupancy with one batched read per poll
+        Slots in merging hold copies that may combine into one, polling goes on until at most one of them is
+        still occupied and the empty ones are cleared, if they never merge they are kept as they are
+        Only falls back to fix_bench_state when the other slots still disagree after the timeout"""
+        expected: list[bool] = self.expected_bench_occupancy()
+        observed: list[bool] = []
+
+        def others_match() -> bool:
+            return all(seen == wanted for index, (seen, wanted) in enumerate(zip(observed, expected))
+                       if index not in merging)
+
+        def bench_matches() -> bool:
+            observed[:] = arena_functions.bench_occupied_check()
+            return others_match() and sum(observed[index] for index in merging) <= 1
+
+        wait.until(bench_matches, timeout=timeout)
+        if not others_match():
+            self.fix_bench_state(observed)
+            return
+        for index in merging:
+            if not observed[index]:
+                self.bench[index] = None
+
     def bought_champion(self, name: str, slot: int) -> None:
         """Purchase champion and creates champion instance"""
         self.bench[slot] = Champion(
@@ -84,8 +123,13 @@ class Arena:
             final_comp=comps.COMP[name]["final_comp"],
         )
         mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
-        sleep(0.5)
-        self.fix_bench_state()
+        copies: tuple[int, ...] = tuple(
+            index for index, champion in enumerate(self.bench)
+            if isinstance(champion, Champion) and champion.name == name
+        )
+        if len(copies) + self.board_names.count(name) < 3:
+            copies = ()
+        self.verify_bench_state(timeout=0.5, merging=copies)
 
     def have_champion(self) -> Champion | None:
         """Checks the bench to see if champion exists"""
@@ -142,6 +186,7 @@ class Arena:
         """Sells all of the champions on the bench"""
         return any(isinstance(slot, str) for slot in self.bench)
 
+    @telemetry.traced()
     def move_champions(self) -> None:
         """Moves champions to the board"""
         self.level: int = arena_functions.get_level()
@@ -154,8 +199,8 @@ class Arena:
             else:
                 bought_unknown = False
                 shop: list = arena_functions.get_shop()
+                gold: int = arena_functions.get_gold()
                 for champion in shop:
-                    gold: int = arena_functions.get_gold()
                     valid_champ: bool = (
                         champion[1] in game_assets.CHAMPIONS
                         and game_assets.champion_gold_cost(champion[1]) <= gold
@@ -212,12 +257,14 @@ class Arena:
                     self.bench[index] = None
                     self.anvil_free[index] = True
 
+    @telemetry.traced()
     def clear_anvil(self) -> None:
         """Clears anvil on the bench, selects middle item"""
+        anvil_opened = wait.region_settled(screen_coords.ANVIL_MSG_POS.get_coords())
         for index, champion in enumerate(self.bench):
             if champion is None and not self.anvil_free[index]:
                 mk_functions.press_e(screen_coords.BENCH_LOC[index].get_coords())
-        sleep(0.5)
+        wait.until(anvil_opened, timeout=0.5)
         anvil_msg: str = ocr.get_text(
             screenxy=screen_coords.ANVIL_MSG_POS.get_coords(),
             scale=3,
@@ -226,70 +273,37 @@ class Arena:
         )
         if anvil_msg == "ChooseOne":
             print("  Clear anvil")
+            anvil_closed = wait.region_changed(screen_coords.ANVIL_MSG_POS.get_coords())
             mk_functions.left_click(screen_coords.BUY_LOC[2].get_coords())
-            sleep(1)
+            wait.until(anvil_closed, timeout=1)
 
+    @telemetry.traced()
     def place_items(self) -> None:
-        """Iterates through items and tries to add them to champion"""
+        """Reads the item bench and places every item the planner finds a champion for"""
         self.items = arena_functions.get_items()
         print(f"  Items: {list(filter((None).__ne__, self.items))}")
-        for index, _ in enumerate(self.items):
-            if self.items[index] is not None:
-                self.add_item_to_champs(index)
-
-    def add_item_to_champs(self, item_index: int) -> None:
-        """Iterates through champions in the board and checks if the champion needs items"""
-        for champ_name in comps.COMP:
-            for champ in self.board:
-                if champ_name == champ.name:
-                    if champ.does_need_items() and self.items[item_index] is not None:
-                        self.add_item_to_champ(item_index, champ)
-                    break
-
-    def add_item_to_champ(self, item_index: int, champ: Champion) -> None:
-        """Takes item index and champ and applies the item"""
-        item = self.items[item_index]
-        if item in game_assets.FULL_ITEMS:
-            if item in champ.build:
-                mk_functions.left_click(
-                    screen_coords.ITEM_POS[item_index][0].get_coords()
-                )
-                mk_functions.left_click(champ.coords)
-                print(f"  Placed {item} on {champ.name}")
-                champ.completed_items.append(item)
-                champ.build.remove(item)
-                self.items[self.items.index(item)] = None
-        elif len(champ.current_building) == 0:
-            item_to_move: None = None
-            for build_item in champ.build:
-                build_item_components: list = list(game_assets.FULL_ITEMS[build_item])
-                if item in build_item_components:
-                    item_to_move: None = item
-                    build_item_components.remove(item_to_move)
-                    champ.current_building.append(
-                        (build_item, build_item_components[0])
-                    )
-                    champ.build.remove(build_item)
-            if item_to_move is not None:
-                mk_functions.left_click(
-                    screen_coords.ITEM_POS[item_index][0].get_coords()
-                )
-                mk_functions.left_click(champ.coords)
-                print(f"  Placed {item} on {champ.name}")
-                self.items[self.items.index(item)] = None
+        for placement in self.item_planner.plan(self.items, self.board):
+            self.apply_placement(placement)
+
+    def apply_placement(self, placement: Placement) -> None:
+        """Drags the item onto the champion and updates the champion's build"""
+        champ: Champion = placement.champion
+        mk_functions.left_click(
+            screen_coords.ITEM_POS[placement.item_index][0].get_coords()
+        )
+        mk_functions.left_click(champ.coords)
+        print(f"  Placed {placement.item} on {champ.name}")
+        self.items[placement.item_index] = None
+        if placement.item == placement.target:
+            champ.completed_items.append(placement.item)
+            champ.build.remove(placement.item)
+        elif placement.completes:
+            champ.completed_items.append(placement.target)
+            champ.current_building.clear()
+            print(f"  Completed {placement.target}")
         else:
-            for builditem in champ.current_building:
-                if item == builditem[1]:
-                    mk_functions.left_click(
-                        screen_coords.ITEM_POS[item_index][0].get_coords()
-                    )
-                    mk_functions.left_click(champ.coords)
-                    champ.completed_items.append(builditem[0])
-                    champ.current_building.clear()
-                    self.items[self.items.index(item)] = None
-                    print(f"  Placed {item} on {champ.name}")
-                    print(f"  Completed {builditem[0]}")
-                    return
+            champ.current_building.append((placement.target, placement.missing))
+            champ.build.remove(placement.target)
 
     def fix_unknown(self) -> None:
         """Checks if the item passed in arg one is valid"""
@@ -350,11 +364,13 @@ class Arena:
         except TypeError:
             print("  Item could not be read for Tacticians Check")
 
+    @telemetry.traced()
     def spend_gold(self, speedy=False) -> None:
-        """Spends gold every round"""
+        """Spends gold every round, gold is read once per shop and tracked from champion costs after that"""
         first_run = True
         min_gold = 100 if speedy else (24 if self.spam_roll else 56)
-        while first_run or arena_functions.get_gold() >= min_gold:
+        gold: int = 0
+        while first_run or gold >= min_gold:
             if not first_run:
                 if arena_functions.get_level() != 10:
                     mk_functions.buy_xp()
@@ -369,7 +385,9 @@ class Arena:
                     break
                 if all(champ[1] == "" for champ in shop):
                     print("  Waiting encounter round animation ends")
-                    sleep(1)
+                    wait.until(wait.any_of(wait.region_changed(screen_coords.SHOP_POS.get_coords()),
+                                           wait.region_changed(screen_coords.ANVIL_MSG_POS.get_coords())),
+                               timeout=1)
                     anvil_msg: str = ocr.get_text(
                     screenxy=screen_coords.ANVIL_MSG_POS.get_coords(),
                     scale=3,
@@ -379,8 +397,9 @@ class Arena:
                     if anvil_msg in ["ChooseOne", "Feelinglucky"]:
                         sleep(2)
                         print("  Choosing item")
+                        item_chosen = wait.region_settled(screen_coords.SHOP_POS.get_coords())
                         mk_functions.left_click(screen_coords.BUY_LOC[2].get_coords())
-                        sleep(1.5)
+                        wait.until(item_chosen, timeout=1.5)
                         shop: list = arena_functions.get_shop()
                         break
                     shop: list = arena_functions.get_shop()
@@ -388,18 +407,14 @@ class Arena:
                     break
 
             print(f"  Shop: {shop}")
-            for champion in shop:
-                if (
-                    self.champs_to_buy.get(champion[1], -1) >= 0
-                    and arena_functions.get_gold()
-                    - game_assets.CHAMPIONS[champion[1]]["Gold"]
-                    >= 0
-                ):
-                    self.buy_champion(champion, 1)
+            gold = arena_functions.get_gold()
+            for champion in self.shop_engine.decide(shop, gold, self.champs_to_buy):
+                if self.buy_champion(champion, 1):
+                    gold -= game_assets.champion_gold_cost(champion[1])
             first_run = False
 
-    def buy_champion(self, champion, quantity) -> None:
-        """Buy champion in shop"""
+    def buy_champion(self, champion, quantity) -> bool:
+        """Buy champion in shop, returns if the purchase went through"""
         none_slot: int = arena_functions.empty_slot()
         if none_slot != -1:
             mk_functions.left_click(screen_coords.BUY_LOC[champion[0]].get_coords())
@@ -407,72 +422,85 @@ class Arena:
             self.bought_champion(champion[1], none_slot)
             if champion[1] in self.champs_to_buy:
                 self.champs_to_buy[champion[1]] -= quantity
-        else:
-            # Try to buy champ 3 when bench is full
-            print(f"  Board is full but want {champion[1]}")
-            mk_functions.left_click(screen_coords.BUY_LOC[champion[0]].get_coords())
-            game_functions.default_pos()
-            sleep(0.5)
-            self.fix_bench_state()
-            none_slot = arena_functions.empty_slot()
-            sleep(0.5)
-            if none_slot != -1:
-                print(f"    Purchased {champion[1]}")
-                if champion[1] in self.champs_to_buy:
-                    self.champs_to_buy[champion[1]] -= quantity
+            return True
+        # Try to buy champ 3 when bench is full
+        print(f"  Board is full but want {champion[1]}")
+        mk_functions.left_click(screen_coords.BUY_LOC[champion[0]].get_coords())
+        game_functions.default_pos()
+        sleep(0.5)
+        self.fix_bench_state()
+        none_slot = arena_functions.empty_slot()
+        sleep(0.5)
+        if none_slot != -1:
+            print(f"    Purchased {champion[1]}")
+            if champion[1] in self.champs_to_buy:
+                self.champs_to_buy[champion[1]] -= quantity
+            return True
+        return False
 
     def buy_xp_round(self) -> None:
         """Buys XP if gold is equals or over 4"""
         if arena_functions.get_gold() >= 4:
             mk_functions.buy_xp()
 
-    def pick_augment(self) -> None:
-        """Picks an augment from user defined augment priority list or defaults to the augment that not in AVOID list"""
+    def augment_area(self) -> tuple:
+        """Screen coordinates of the box around all three augment card names"""
+        cards: list[tuple] = [coords.get_coords() for coords in screen_coords.AUGMENT_POS]
+        return (min(card[0] for card in cards), min(card[1] for card in cards),
+                max(card[2] for card in cards), max(card[3] for card in cards))
+
+    def read_augments(self, rerolled: Callable[[], bool] | None = None) -> list[str]:
+        """Reads the three augment cards from one frame once they stop animating, until every card has text
+        rerolled is a wait.region_settled predicate created before clicking the reroll buttons, without it the
+        cards from before the reroll animation starts look stable and would be read again"""
+        cards: list[tuple] = [coords.get_coords() for coords in screen_coords.AUGMENT_POS]
         while True:
-            sleep(1)
-            augments: list = []
-            for coords in screen_coords.AUGMENT_POS:
-                augment: str = ocr.get_text(
-                    screenxy=coords.get_coords(), scale=3, psm=7
-                )
-                augments.append(augment)
+            if rerolled is not None:
+                wait.until(rerolled, timeout=2)
+                rerolled = None
+            else:
+                wait.until(wait.region_stable(self.augment_area()), timeout=1)
+            screenshot = frame.current()
+            readers: list = [
+                ocr.read(screenshot.region(card), scale=3, psm=7, whitelist=ocr.AUGMENT_WHITELIST, screenxy=card)
+                for card in cards
+            ]
+            augments: list[str] = [reader.result() for reader in readers]
             print(f"  Augments: {augments}")
-            if len(augments) == 3 and "" not in augments:
-                break
-
-        for potential in comps.AUGMENTS:
-            for augment in augments:
-                if potential in augment:
-                    print(f"  Choosing augment {augment}")
-                    mk_functions.left_click(
-                        screen_coords.AUGMENT_LOC[augments.index(augment)].get_coords()
-                    )
-                    return
+            if "" not in augments:
+                return augments
 
-        if self.augment_roll:
+    @telemetry.traced()
+    def pick_augment(self) -> None:
+        """Picks an augment from user defined augment priority list or defaults to the augment that not in AVOID list
+        Rerolls every card once if none of them are on the priority list"""
+        rerolled: Callable[[], bool] | None = None
+        while True:
+            augments: list[str] = self.read_augments(rerolled)
+            choice: int | None = augment_matcher.AUGMENTS.best(augments)
+            if choice is not None:
+                print(f"  Choosing augment {augments[choice]}")
+                self.select_augment(choice)
+                return
+            if not self.augment_roll:
+                break
             print("  Rolling for augment")
+            rerolled = wait.region_settled(self.augment_area())
             for i in range(0, 3):
                 mk_functions.left_click(screen_coords.AUGMENT_ROLL[i].get_coords())
             self.augment_roll = False
-            self.pick_augment()
-            return
 
         print(
             "  [!] No priority or backup augment found, undefined behavior may occur for the rest of the round"
         )
-
-        for augment in augments:
-            found = False
-            for potential in comps.AVOID_AUGMENTS:
-                if potential in augment:
-                    found = True
-                    break
-            if not found:
-                mk_functions.left_click(
-                    screen_coords.AUGMENT_LOC[augments.index(augment)].get_coords()
-                )
-                return
-        mk_functions.left_click(screen_coords.AUGMENT_LOC[0].get_coords())
+        self.select_augment(augment_matcher.AUGMENTS.fallback(augments))
+
+    def select_augment(self, index: int) -> None:
+        """Clicks the augment and waits for the augment cards to clear"""
+        cards_cleared = wait.region_settled(screen_coords.AUGMENT_POS[index].get_coords())
+        mk_functions.left_click(screen_coords.AUGMENT_LOC[index].get_coords())
+        # Can't purchase champions for a short period after choosing augment
+        wait.until(cards_cleared, timeout=2.5)
 
     def check_health(self) -> None:
         """Checks if current health is below 30 and conditionally activates spam roll"""
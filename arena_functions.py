@@ -2,27 +2,35 @@
 Functions used by the Arena class to get game data
 """
 
-from difflib import SequenceMatcher
-import threading
-from PIL import ImageGrab
+from functools import lru_cache
 import numpy as np
 import requests
+import digit_reader
+import frame
 import screen_coords
 import ocr
 import game_assets
+import live_client
 import mk_functions
-from vec4 import Vec4
+import settings
+from name_matcher import NameIndex
+from template_matcher import TemplateBank
+
+HEALTH_BAR_COLOR: list[int] = [0, 255, 18]
+
+CHAMPION_INDEX = NameIndex(game_assets.CHAMPIONS)
+
+ITEM_INDEX = NameIndex(game_assets.ITEMS)
+
+CHAMPION_TEMPLATES: TemplateBank = TemplateBank.load(settings.CHAMPION_TEMPLATES_PATH, (96, 16))
+
+ITEM_TEMPLATES: TemplateBank = TemplateBank.load(settings.ITEM_TEMPLATES_PATH, (16, 16), color=True)
 
 
 def get_level() -> int:
     """Returns the level for the tactician"""
     try:
-        response = requests.get(
-            "https://127.0.0.1:2999/liveclientdata/allgamedata",
-            timeout=10,
-            verify=False,
-        )
-        return int(response.json()["activePlayer"]["level"])
+        return int(live_client.CLIENT.active_player()["level"])
     except (requests.exceptions.ConnectionError, KeyError):
         return 1
 
@@ -30,19 +38,17 @@ def get_level() -> int:
 def get_health() -> int:
     """Returns the health for the tactician"""
     try:
-        response = requests.get(
-            "https://127.0.0.1:2999/liveclientdata/allgamedata",
-            timeout=10,
-            verify=False,
-        )
-        return int(response.json()["activePlayer"]["championStats"]["currentHealth"])
+        return int(live_client.CLIENT.active_player()["championStats"]["currentHealth"])
     except (requests.exceptions.ConnectionError, KeyError):
         return -1
 
 
 def get_gold() -> int:
-    """Returns the gold for the tactician"""
-    gold: str = ocr.get_text(
+    """Returns the gold for the tactician, read with the digit templates and Tesseract when they aren't sure"""
+    gold, confidence = digit_reader.READER.read(frame.current().region(screen_coords.GOLD_POS.get_coords()))
+    if confidence >= settings.DIGIT_CONFIDENCE and gold.isdigit():
+        return int(gold)
+    gold = ocr.get_text(
         screenxy=screen_coords.GOLD_POS.get_coords(),
         scale=3,
         psm=7,
@@ -54,94 +60,100 @@ def get_gold() -> int:
         return 0
 
 
-def valid_champ(champ: str) -> str:
-    """Matches champion string to a valid champion name string and returns it"""
-    if champ in game_assets.CHAMPIONS:
-        return champ
-
-    return next(
-        (
-            champion
-            for champion in game_assets.CHAMPIONS
-            if SequenceMatcher(a=champion, b=champ).ratio() >= 0.7
-        ),
-        "",
-    )
+@lru_cache(maxsize=1024)
+def match_champ(champ: str) -> tuple[str, float]:
+    """Returns the closest valid champion name to the OCR string and its match score"""
+    name, score = CHAMPION_INDEX.match(champ, threshold=0.7)
+    return name or "", score
 
 
-def get_champ(
-    screen_capture: ImageGrab.Image, name_pos: Vec4, shop_pos: int, shop_array: list
-) -> str:
-    """Returns a tuple containing the shop position and champion name"""
-    champ: str = screen_capture.crop(name_pos.get_coords())
-    champ: str = ocr.get_text_from_image(image=champ, whitelist=ocr.ALPHABET_WHITELIST)
-    shop_array.append((shop_pos, valid_champ(champ)))
+def valid_champ(champ: str) -> str:
+    """Matches champion string to a valid champion name string and returns it"""
+    return match_champ(champ)[0]
 
 
 def get_shop() -> list:
-    """Returns the list of champions in the shop"""
-    screen_capture = ImageGrab.grab(bbox=screen_coords.SHOP_POS.get_coords())
+    """Returns the list of champions in the shop
+    Slots are matched against the champion name templates first, low confidence slots are read by the OCR workers"""
+    screen_capture = frame.current().image(screen_coords.SHOP_POS.get_coords())
+    name_crops: list = [screen_capture.crop(name_pos.get_coords()) for name_pos in screen_coords.CHAMP_NAME_POS]
     shop: list = []
-    thread_list: list = []
-    for shop_index, name_pos in enumerate(screen_coords.CHAMP_NAME_POS):
-        thread = threading.Thread(
-            target=get_champ, args=(screen_capture, name_pos, shop_index, shop)
-        )
-        thread_list.append(thread)
-    for thread in thread_list:
-        thread.start()
-    for thread in thread_list:
-        thread.join()
+    pending: list = []
+    matches: list = CHAMPION_TEMPLATES.match_many([np.asarray(name_crop) for name_crop in name_crops])
+    for shop_index, (champ, score) in enumerate(matches):
+        if score >= settings.SHOP_TEMPLATE_CONFIDENCE:
+            shop.append((shop_index, valid_champ(champ)))
+        else:
+            pending.append(
+                (shop_index, ocr.submit_text_from_image(image=name_crops[shop_index], whitelist=ocr.ALPHABET_WHITELIST))
+            )
+    shop.extend((shop_index, valid_champ(future.result())) for shop_index, future in pending)
     return sorted(shop)
 
 
+def health_bar_slots(bench_strip: np.ndarray, slot_columns: np.ndarray, run_length: int = 5) -> np.ndarray:
+    """Returns which slots of a bench strip image contain a horizontal run of health bar colored pixels
+    slot_columns is an (n, 2) array of each slot's [start, end) columns inside the strip"""
+    is_health_color = np.all(bench_strip == HEALTH_BAR_COLOR, axis=-1)
+    row_sums = np.zeros((is_health_color.shape[0], is_health_color.shape[1] + 1), dtype=np.int32)
+    np.cumsum(is_health_color, axis=1, out=row_sums[:, 1:])
+    run_starts = np.any(row_sums[:, run_length:] - row_sums[:, :-run_length] == run_length, axis=0)
+    column_sums = np.concatenate(([0], np.cumsum(run_starts)))
+    last_start = np.clip(slot_columns[:, 1] - run_length + 1, slot_columns[:, 0], len(run_starts))
+    return column_sums[last_start] - column_sums[np.minimum(slot_columns[:, 0], last_start)] > 0
+
+
+def bench_occupancy() -> np.ndarray:
+    """Returns a boolean array that maps to each bench slot indicating if its occupied"""
+    slot_coords = np.array([positions.get_coords() for positions in screen_coords.BENCH_HEALTH_POS])
+    strip_coords: tuple = (slot_coords[:, 0].min(), slot_coords[:, 1].min(),
+                           slot_coords[:, 2].max(), slot_coords[:, 3].max())
+    bench_strip: np.ndarray = frame.current().region(strip_coords)
+    return health_bar_slots(bench_strip, slot_coords[:, [0, 2]] - strip_coords[0])
+
+
 def empty_slot() -> int:
     """Finds the first empty spot on the bench"""
-    for slot, positions in enumerate(screen_coords.BENCH_HEALTH_POS):
-        screen_capture = ImageGrab.grab(bbox=positions.get_coords())
-        screenshot_array = np.array(screen_capture)
-        is_health_color = np.all(screenshot_array == [0, 255, 18], axis=-1)
-        if not any(np.convolve(is_health_color.reshape(-1), np.ones(5), mode='valid')):
-            return slot  # Slot 0-8
-    return -1  # No empty slot
+    occupied: np.ndarray = bench_occupancy()
+    if occupied.all():
+        return -1  # No empty slot
+    return int(np.argmin(occupied))  # Slot 0-8
 
 
 def bench_occupied_check() -> list:
     """Returns a list of booleans that map to each bench slot indicating if its occupied"""
-    bench_occupied: list = []
-    for positions in screen_coords.BENCH_HEALTH_POS:
-        screen_capture = ImageGrab.grab(bbox=positions.get_coords())
-        screenshot_array = np.array(screen_capture)
-        is_health_color = np.all(screenshot_array == [0, 255, 18], axis=-1)
-        occupied = any(np.convolve(is_health_color.reshape(-1), np.ones(5), mode='valid'))
-        bench_occupied.append(occupied)
-    return bench_occupied
+    return bench_occupancy().tolist()
+
+
+@lru_cache(maxsize=1024)
+def match_item(item: str) -> tuple[str | None, float]:
+    """Returns the closest valid item name to the OCR string and its match score"""
+    return ITEM_INDEX.match(item, threshold=0.85, allow_substring=True)
 
 
 def valid_item(item: str) -> str | None:
     """Checks if the item passed in arg one is valid"""
-    return next(
-        (
-            valid_item_name
-            for valid_item_name in game_assets.ITEMS
-            if valid_item_name in item
-            or SequenceMatcher(a=valid_item_name, b=item).ratio() >= 0.85
-        ),
-        None,
-    )
+    return match_item(item)[0]
 
 
 def get_items() -> list:
-    """Returns a list of items currently on the board"""
+    """Returns a list of items currently on the board
+    Every slot's icon is classified from one frame, only low confidence slots are hovered and read from the tooltip"""
+    screen_capture = frame.current()
+    icons: list = [screen_capture.region(icon_pos.get_coords()) for icon_pos in screen_coords.ITEM_ICON_POS]
     item_bench: list = []
-    for positions in screen_coords.ITEM_POS:
-        mk_functions.move_mouse(positions[0].get_coords())
-        item: str = ocr.get_text(
-            screenxy=positions[1].get_coords(),
-            scale=3,
-            psm=7,
-            whitelist=ocr.ALPHABET_WHITELIST,
-        )
+    hovered = False
+    for positions, (item, score) in zip(screen_coords.ITEM_POS, ITEM_TEMPLATES.match_many(icons)):
+        if score < settings.ITEM_TEMPLATE_CONFIDENCE:
+            mk_functions.move_mouse(positions[0].get_coords())
+            item: str = ocr.get_text(
+                screenxy=positions[1].get_coords(),
+                scale=3,
+                psm=7,
+                whitelist=ocr.ALPHABET_WHITELIST,
+            )
+            hovered = True
         item_bench.append(valid_item(item))
-    mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
+    if hovered:
+        mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
     return item_bench
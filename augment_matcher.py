@@ -0,0 +1,98 @@
+"""
+Ranks augment card text against the comp's augment priority and avoid lists in one pass over the text
+Both lists are compiled into a single Aho-Corasick automaton, so a card is matched against every entry at once
+Text and entries are normalized the same way: case and spacing are ignored and a roman numeral tier suffix
+is canonicalized so OCR misreads like "Il" or "1I" still match "II"
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+import comps
+
+ROMAN_SUFFIX = re.compile(r"\s+([IVXl1|]{1,4})$")
+
+
+def normalize(text: str) -> str:
+    """Collapses whitespace, canonicalizes a trailing roman numeral and lowercases the text"""
+    text = " ".join(text.split())
+    text = ROMAN_SUFFIX.sub(lambda numeral: " " + numeral.group(1).replace("l", "I").replace("1", "I")
+                            .replace("|", "I"), text)
+    return text.casefold()
+
+
+class AhoCorasick:  # pylint: disable=too-few-public-methods
+    """Automaton over a fixed set of patterns that reports every pattern contained in a text"""
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.transitions: list[dict[str, int]] = [{}]
+        self.outputs: list[set[int]] = [set()]
+        self.fail: list[int] = [0]
+        for pattern_id, pattern in enumerate(patterns):
+            state: int = 0
+            for character in pattern:
+                if character not in self.transitions[state]:
+                    self.transitions.append({})
+                    self.outputs.append(set())
+                    self.fail.append(0)
+                    self.transitions[state][character] = len(self.transitions) - 1
+                state = self.transitions[state][character]
+            self.outputs[state].add(pattern_id)
+
+        pending: deque = deque(self.transitions[0].values())
+        while pending:
+            state = pending.popleft()
+            for character, child in self.transitions[state].items():
+                pending.append(child)
+                fallback: int = self.fail[state]
+                while fallback and character not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.transitions[fallback].get(character, 0)
+                self.outputs[child] |= self.outputs[self.fail[child]]
+
+    def search(self, text: str) -> set[int]:
+        """Returns the ids of every pattern found in the text"""
+        found: set[int] = set()
+        state: int = 0
+        for character in text:
+            while state and character not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(character, 0)
+            found |= self.outputs[state]
+        return found
+
+
+@dataclass
+class CardRank:
+    """Where a card's text falls in the augment lists"""
+
+    priority: int | None
+    avoided: bool
+
+
+class AugmentIndex:
+    """Compiled priority and avoid lists, the lower the priority rank the more the augment is wanted"""
+
+    def __init__(self, priority: list[str], avoid: list[str]) -> None:
+        self.priority_count: int = len(priority)
+        self.automaton = AhoCorasick([normalize(augment) for augment in priority + avoid])
+
+    def rank(self, text: str) -> CardRank:
+        """Returns the best priority rank of the entries contained in the card and whether it is avoided"""
+        found: set[int] = self.automaton.search(normalize(text))
+        ranks: list[int] = [pattern_id for pattern_id in found if pattern_id < self.priority_count]
+        return CardRank(min(ranks, default=None), any(pattern_id >= self.priority_count for pattern_id in found))
+
+    def best(self, cards: list[str]) -> int | None:
+        """Returns the index of the card with the best priority rank, None if no card is on the priority list"""
+        ranked: list[tuple[int, int]] = [
+            (rank.priority, index) for index, rank in enumerate(map(self.rank, cards)) if rank.priority is not None
+        ]
+        return min(ranked)[1] if ranked else None
+
+    def fallback(self, cards: list[str]) -> int:
+        """Returns the first card that isn't avoided, the first card if every one is"""
+        return next((index for index, card in enumerate(cards) if not self.rank(card).avoided), 0)
+
+
+AUGMENTS = AugmentIndex(comps.AUGMENTS, comps.AVOID_AUGMENTS)
@@ -104,10 +104,10 @@ def change_arena_skin(client_info: tuple) -> bool:
         return False
 
 
-def get_client() -> tuple:
-    """Gets data about the client such as port and auth token"""
+def get_client(client_path: str | None = None) -> tuple:
+    """Gets data about the client such as port and auth token, from the settings client unless a path is passed"""
     print("\n\n[Auto Queue]")
-    file_path = settings.LEAGUE_CLIENT_PATH + "\\lockfile"
+    file_path = (client_path or settings.LEAGUE_CLIENT_PATH) + "\\lockfile"
     got_lock_file = False
     while not got_lock_file:
         try:
@@ -134,9 +134,9 @@ def reconnect(client_info: tuple) -> None:
     )
 
 
-def queue() -> None:
+def queue(client_path: str | None = None) -> None:
     """Function that handles getting into a game"""
-    client_info: tuple = get_client()
+    client_info: tuple = get_client(client_path)
     while check_game_status(client_info) == "InProgress":
         sleep(2)
     if check_game_status(client_info) == "Reconnect":
@@ -0,0 +1,237 @@
+"""
+Microbenchmarks that replay stored screenshot crops or generated OCR noise through the bot's hot paths
+Usage: python benchmark.py <benchmark> [--crops <crop directory>] [--repeat N] [--workers N ...]
+"""
+
+import argparse
+from difflib import SequenceMatcher
+import random
+import statistics
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+import numpy as np
+from PIL import Image
+from tesserocr import PyTessBaseAPI
+import arena_functions
+import digit_reader
+import game_assets
+import ocr
+import ocr_service
+import settings
+
+
+def load_crops(directory: str | None) -> list[Image.Image]:
+    """Loads every png crop in the directory passed in"""
+    if directory is None:
+        raise ValueError("This benchmark needs a directory of crops, pass one with --crops")
+    crops: list = [Image.open(path).convert("RGB") for path in sorted(Path(directory).glob("*.png"))]
+    if not crops:
+        raise ValueError(f"No .png crops found in {directory}")
+    return crops
+
+
+def crop_labels(directory: str) -> list[str]:
+    """Expected text of every png crop, the file name up to the first underscore like the template crops"""
+    return [path.stem.split("_")[0] for path in sorted(Path(directory).glob("*.png"))]
+
+
+def time_calls(function: Callable, inputs: list, repeat: int) -> list[float]:
+    """Calls the function for every input repeat times and returns the per-call latency in milliseconds"""
+    latencies: list[float] = []
+    for _ in range(repeat):
+        for value in inputs:
+            start: float = perf_counter()
+            function(value)
+            latencies.append((perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    """Prints latency statistics for a benchmarked path"""
+    ordered: list[float] = sorted(latencies)
+    print(
+        f"  {name:<12} calls={len(ordered):<6} mean={statistics.fmean(ordered):8.3f}ms "
+        f"median={statistics.median(ordered):8.3f}ms p95={ordered[int(len(ordered) * 0.95) - 1]:8.3f}ms"
+    )
+
+
+def unpooled_text_from_image(image: Image.Image, whitelist: str = "") -> str:
+    """The pre-pool OCR path that constructs a Tesseract handle for every call"""
+    resize = ocr.image_resize(image, 3)
+    array = ocr.image_array(resize)
+    grayscale = ocr.image_grayscale(array)
+    thresholding = ocr.image_thresholding(grayscale)
+    with PyTessBaseAPI(path=ocr.TESSDATA_PATH) as api:
+        api.SetVariable("tessedit_char_whitelist", whitelist)
+        api.SetPageSegMode(7)
+        api.SetImageBytes(thresholding.tobytes(), thresholding.shape[1], thresholding.shape[0], 1,
+                          thresholding.shape[1])
+        text = api.GetUTF8Text()
+    return text.strip()
+
+
+def noisy_corpus(names: list[str], size: int, seed: int = 0) -> list[tuple[str, str]]:
+    """Generates (name, misread) pairs of OCR-like misreads with dropped, swapped and inserted characters"""
+    generator = random.Random(seed)
+    corpus: list[tuple[str, str]] = []
+    for _ in range(size):
+        name: str = generator.choice(names)
+        text: list[str] = list(name)
+        for _ in range(generator.randint(0, 2)):
+            position: int = generator.randrange(len(text))
+            edit: int = generator.randint(0, 2)
+            if edit == 0 and len(text) > 1:
+                del text[position]
+            elif edit == 1:
+                text[position] = generator.choice(ocr.ALPHABET_WHITELIST)
+            else:
+                text.insert(position, generator.choice(ocr.ALPHABET_WHITELIST))
+        corpus.append((name, "".join(text)))
+    return corpus
+
+
+def report_matches(name: str, function: Callable, corpus: list[tuple[str, str]], reference: Callable) -> None:
+    """Prints how often a name matcher finds the misread name, leaves it unresolved and agrees with the reference"""
+    results: list = [function(text) for _, text in corpus]
+    expected: list = [reference(text) for _, text in corpus]
+    recall: float = sum(result == truth for result, (truth, _) in zip(results, corpus)) / len(corpus)
+    unresolved: int = sum(result in ("", None) for result in results)
+    agreement: float = sum(result == old for result, old in zip(results, expected)) / len(corpus)
+    print(f"  {name:<12} recall={recall:6.1%} unresolved={unresolved:<5} agreement with scan={agreement:6.1%}")
+
+
+def scan_champ(champ: str) -> str:
+    """The pre-index champion lookup that ratios every name until one is over the threshold"""
+    if champ in game_assets.CHAMPIONS:
+        return champ
+    return next(
+        (champion for champion in game_assets.CHAMPIONS if SequenceMatcher(a=champion, b=champ).ratio() >= 0.7),
+        "",
+    )
+
+
+def scan_item(item: str) -> str | None:
+    """The pre-index item lookup that ratios every name until one is over the threshold"""
+    return next(
+        (
+            valid_item_name
+            for valid_item_name in game_assets.ITEMS
+            if valid_item_name in item or SequenceMatcher(a=valid_item_name, b=item).ratio() >= 0.85
+        ),
+        None,
+    )
+
+
+def benchmark_names(arguments: argparse.Namespace) -> None:
+    """Compares the linear SequenceMatcher scans against the trigram index with and without its LRU cache
+    Reports how many misreads each resolves to the right name as well as the latency"""
+    champ_corpus: list[tuple[str, str]] = noisy_corpus(sorted(game_assets.CHAMPIONS), 2000)
+    item_corpus: list[tuple[str, str]] = noisy_corpus(sorted(game_assets.ITEMS), 2000, seed=1)
+    champs: list[str] = [text for _, text in champ_corpus]
+    items: list[str] = [text for _, text in item_corpus]
+    print(f"[Name matching] {len(champs)} champion and {len(items)} item strings x {arguments.repeat}")
+    report_matches("champ scan", scan_champ, champ_corpus, scan_champ)
+    report_matches("champ index", arena_functions.valid_champ, champ_corpus, scan_champ)
+    report_matches("item scan", scan_item, item_corpus, scan_item)
+    report_matches("item index", arena_functions.valid_item, item_corpus, scan_item)
+    report("champ scan", time_calls(scan_champ, champs, arguments.repeat))
+    report("champ index", time_calls(lambda text: arena_functions.CHAMPION_INDEX.match(text, 0.7), champs,
+                                     arguments.repeat))
+    report("champ cached", time_calls(arena_functions.valid_champ, champs, arguments.repeat))
+    report("item scan", time_calls(scan_item, items, arguments.repeat))
+    report("item index", time_calls(lambda text: arena_functions.ITEM_INDEX.match(text, 0.85, True), items,
+                                    arguments.repeat))
+    report("item cached", time_calls(arena_functions.valid_item, items, arguments.repeat))
+
+
+def benchmark_ocr_pool(arguments: argparse.Namespace) -> None:
+    """Compares a fresh Tesseract handle per call against the pooled handles
+    Both sides preprocess and read inline, so the result cache and the OCR worker processes stay out of the timing"""
+    crops: list[Image.Image] = load_crops(arguments.crops)
+    repeat: int = arguments.repeat
+    print(f"[OCR pool] {len(crops)} crops x {repeat}")
+    ocr.ENGINE_POOL.warm_up([(ocr.ALPHABET_WHITELIST, 7)])
+    report("unpooled", time_calls(lambda crop: unpooled_text_from_image(crop, ocr.ALPHABET_WHITELIST), crops, repeat))
+    report("pooled", time_calls(
+        lambda crop: ocr.recognize(ocr.prepare_image(crop, 3), ocr.ALPHABET_WHITELIST, 7), crops, repeat))
+
+
+def benchmark_ocr_service(arguments: argparse.Namespace) -> None:
+    """Measures crop throughput of the OCR worker processes against inline reads with the pooled handles"""
+    crops: list[Image.Image] = load_crops(arguments.crops) * arguments.repeat
+    thresholded: list = [ocr.prepare_image(crop, 3) for crop in crops]
+    print(f"[OCR service] {len(crops)} crops")
+    ocr.ENGINE_POOL.warm_up([(ocr.ALPHABET_WHITELIST, 7)])
+    start: float = perf_counter()
+    for image in thresholded:
+        ocr.recognize(image, ocr.ALPHABET_WHITELIST, 7)
+    print(f"  {'inline':<12} {len(crops) / (perf_counter() - start):8.1f} crops/s")
+    for workers in arguments.workers:
+        service = ocr_service.OcrService(workers)
+        # Every worker builds its handle on its first read, keep that out of the timed run
+        for future in [service.submit(image, ocr.ALPHABET_WHITELIST, 7) for image in thresholded[:workers * 2]]:
+            future.result()
+        start = perf_counter()
+        for future in [service.submit(image, ocr.ALPHABET_WHITELIST, 7) for image in thresholded]:
+            future.result()
+        print(f"  {f'{workers} workers':<12} {len(crops) / (perf_counter() - start):8.1f} crops/s")
+        service.close()
+
+
+def benchmark_preprocess(arguments: argparse.Namespace) -> None:
+    """Compares the PIL preprocessing against the fused OpenCV path and checks both read the same text
+    Crops are named <expected text>_<anything>.png, each crop is treated as its own fixed screen region"""
+    crops: list[Image.Image] = load_crops(arguments.crops)
+    labels: list[str] = crop_labels(arguments.crops)
+    regions: list = [(np.asarray(crop), (index,)) for index, crop in enumerate(crops)]
+    print(f"[Preprocess] {len(crops)} crops x {arguments.repeat}")
+
+    def fused(region: tuple) -> np.ndarray:
+        stage: ocr.Preprocessor = ocr.preprocessor(region[0], 3, region[1])
+        with stage.lock:
+            return stage.run(region[0]).copy()
+
+    report("pil", time_calls(lambda crop: ocr.prepare_image(crop, 3), crops, arguments.repeat))
+    report("fused", time_calls(fused, regions, arguments.repeat))
+    reference: list[str] = [ocr.recognize(ocr.prepare_image(crop, 3), "", 7) for crop in crops]
+    candidate: list[str] = [ocr.recognize(fused(region), "", 7) for region in regions]
+    for name, texts in (("pil", reference), ("fused", candidate)):
+        correct: int = sum(text.replace(" ", "") == label.replace(" ", "") for text, label in zip(texts, labels))
+        print(f"  {name:<12} accuracy={correct}/{len(labels)}")
+    print(f"  agreement    {sum(a == b for a, b in zip(reference, candidate))}/{len(crops)}")
+
+
+def benchmark_digits(arguments: argparse.Namespace) -> None:
+    """Compares the digit templates against Tesseract on gold and round crops named <text>_<anything>.png"""
+    crops: list[Image.Image] = load_crops(arguments.crops)
+    labels: list[str] = crop_labels(arguments.crops)
+    arrays: list[np.ndarray] = [np.asarray(crop) for crop in crops]
+    print(f"[Digits] {len(crops)} crops x {arguments.repeat}")
+    report("templates", time_calls(digit_reader.READER.read, arrays, arguments.repeat))
+    report("tesseract", time_calls(lambda crop: ocr.recognize(ocr.prepare_image(crop, 3), ocr.ROUND_WHITELIST, 7),
+                                   crops, arguments.repeat))
+    reads: list[tuple[str, float]] = [digit_reader.READER.read(array) for array in arrays]
+    confident: list[bool] = [confidence >= settings.DIGIT_CONFIDENCE for _, confidence in reads]
+    correct: int = sum(text == label for (text, _), label in zip(reads, labels))
+    wrong_confident: int = sum(sure and text != label for (text, _), label, sure in zip(reads, labels, confident))
+    print(f"  accuracy={correct}/{len(labels)} confident={sum(confident)} confident but wrong={wrong_confident}")
+
+
+BENCHMARKS: dict[str, Callable] = {
+    "digits": benchmark_digits,
+    "names": benchmark_names,
+    "ocr-pool": benchmark_ocr_pool,
+    "ocr-service": benchmark_ocr_service,
+    "preprocess": benchmark_preprocess,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--crops", help="Directory of .png screenshot crops")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="OCR worker counts to compare")
+    parsed = parser.parse_args()
+    BENCHMARKS[parsed.benchmark](parsed)
@@ -0,0 +1,221 @@
+"""
+Picks a carousel unit by watching the carousel instead of clicking its center until the round ends
+Moving units are found as blobs in the difference of two downscaled frames and tracked between frames,
+every track is classified once against the carousel templates and scored against the comp's needs
+The tactician is sent to where the best unit will be, the round ending is seen as the round label changing
+Analyse a recorded carousel: python carousel.py <clip.mp4 | frames directory> [--fps 30]
+"""
+
+import argparse
+import math
+from dataclasses import dataclass
+from pathlib import Path
+import cv2
+import numpy as np
+from clock import sleep, perf_counter
+import comps
+import frame
+import mk_functions
+import screen_coords
+import settings
+import wait
+from item_planner import ItemPlanner
+from recorded_frames import DirectoryFrames, VideoFrames
+from shop_engine import ShopEngine
+from template_matcher import TemplateBank
+
+CAROUSEL_TEMPLATES: TemplateBank = TemplateBank.load(settings.CAROUSEL_TEMPLATES_PATH, (16, 16), color=True)
+MOTION_THRESHOLD: int = 25
+MIN_BLOB_AREA: int = 6
+MAX_TRACK_JUMP: float = 12.0  # Downscaled pixels a unit can move between two frames
+TRACK_TIMEOUT: float = 0.5
+UNIT_BOX: int = 48  # Size of the full resolution crop around a unit that is classified
+
+
+@dataclass
+class Track:  # pylint: disable=too-many-instance-attributes
+    """A carousel unit followed across frames, positions are in full resolution carousel area pixels"""
+
+    track_id: int
+    x_pos: float
+    y_pos: float
+    last_seen: float
+    angle: float
+    angular_velocity: float = 0.0
+    samples: int = 0
+    label: str = ""
+    confidence: float = 0.0
+
+
+def detect_blobs(previous: np.ndarray, current: np.ndarray) -> list[tuple[float, float]]:
+    """Returns the centroids of regions that moved between two downscaled grayscale frames"""
+    mask: np.ndarray = (cv2.absdiff(previous, current) > MOTION_THRESHOLD).astype(np.uint8)
+    # Leading and trailing edges of a moving unit are separate in the difference, grow them into one blob
+    mask = cv2.dilate(mask, np.ones((5, 5), dtype=np.uint8), iterations=2)
+    count, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    return [tuple(centroids[index]) for index in range(1, count) if stats[index, cv2.CC_STAT_AREA] >= MIN_BLOB_AREA]
+
+
+class CarouselScorer:  # pylint: disable=too-few-public-methods
+    """Values carousel labels, champions by the shop value table and items by the comp builds they go into"""
+
+    def __init__(self, comp: dict) -> None:
+        self.champions: dict[str, float] = ShopEngine(comp).values
+        planner = ItemPlanner(comp)
+        wanted: list[str] = [item for champion_data in comp.values() for item in champion_data["items"]]
+        self.items: dict[str, float] = {
+            component: 3 * len(targets) for component, targets in planner.component_targets.items()
+        }
+        for item in wanted:
+            self.items[item] = self.items.get(item, 0) + 6
+
+    def score(self, label: str) -> float:
+        """Value of the labelled unit or item, 0 for anything the comp doesn't use"""
+        return self.items.get(label, 0.0) + 0.5 * self.champions.get(label, 0.0)
+
+
+class CarouselTracker:
+    """Follows the rotating units of the carousel area through successive frames"""
+
+    def __init__(self, center: tuple[float, float], bank: TemplateBank = CAROUSEL_TEMPLATES,
+                 downscale: int = settings.CAROUSEL_DOWNSCALE) -> None:
+        self.center: tuple[float, float] = center
+        self.bank: TemplateBank = bank
+        self.downscale: int = downscale
+        self.previous: np.ndarray | None = None
+        self.tracks: list[Track] = []
+        self.next_id: int = 0
+
+    def update(self, image: np.ndarray, time: float) -> list[Track]:
+        """Adds a frame of the carousel area and returns the tracks that are currently visible"""
+        gray: np.ndarray = cv2.cvtColor(np.ascontiguousarray(image[..., :3]), cv2.COLOR_RGB2GRAY)
+        small: np.ndarray = cv2.resize(gray, None, fx=1 / self.downscale, fy=1 / self.downscale,
+                                       interpolation=cv2.INTER_AREA)
+        if self.previous is None or self.previous.shape != small.shape:
+            self.previous = small
+            return []
+        blobs: list[tuple[float, float]] = detect_blobs(self.previous, small)
+        self.previous = small
+        unmatched: list[Track] = [track for track in self.tracks if time - track.last_seen <= TRACK_TIMEOUT]
+        visible: list[Track] = []
+        for blob_x, blob_y in blobs:
+            position: tuple[float, float] = (blob_x * self.downscale, blob_y * self.downscale)
+            track: Track | None = self.nearest(unmatched, position)
+            if track is not None:
+                unmatched.remove(track)
+                self.advance(track, position, time)
+            else:
+                track = Track(self.next_id, *position, time, self.angle(position))
+                self.next_id += 1
+            if track.confidence < settings.CAROUSEL_TEMPLATE_CONFIDENCE:
+                self.classify(track, image)
+            visible.append(track)
+        self.tracks = visible + [track for track in unmatched if time - track.last_seen <= TRACK_TIMEOUT]
+        return visible
+
+    def angle(self, position: tuple[float, float]) -> float:
+        """Angle of a carousel area position around the carousel center"""
+        return math.atan2(position[1] - self.center[1], position[0] - self.center[0])
+
+    def nearest(self, tracks: list[Track], position: tuple[float, float]) -> Track | None:
+        """Returns the track closest to the position if the unit could have moved there since the last frame"""
+        closest: Track | None = min(
+            tracks, key=lambda track: math.dist((track.x_pos, track.y_pos), position), default=None
+        )
+        if closest is None or math.dist((closest.x_pos, closest.y_pos), position) > MAX_TRACK_JUMP * self.downscale:
+            return None
+        return closest
+
+    def advance(self, track: Track, position: tuple[float, float], time: float) -> None:
+        """Moves a track to where its unit was seen, updating how fast it turns"""
+        angle: float = self.angle(position)
+        elapsed: float = time - track.last_seen
+        if elapsed > 0:
+            turned: float = math.remainder(angle - track.angle, math.tau)
+            weight: float = 0.3 if track.samples else 1.0
+            track.angular_velocity += weight * (turned / elapsed - track.angular_velocity)
+            track.samples += 1
+        track.x_pos, track.y_pos = position
+        track.angle, track.last_seen = angle, time
+
+    def classify(self, track: Track, image: np.ndarray) -> None:
+        """Labels a track from the full resolution crop around it, keeping the most confident label seen"""
+        half: int = UNIT_BOX // 2
+        crop: np.ndarray = frame.crop(image, (int(track.x_pos) - half, int(track.y_pos) - half,
+                                              int(track.x_pos) + half, int(track.y_pos) + half))
+        if crop.shape[0] < half or crop.shape[1] < half:
+            return
+        label, confidence = self.bank.match(crop)
+        if confidence > track.confidence:
+            track.label, track.confidence = label, confidence
+
+    def angular_velocity(self) -> float:
+        """Median turning speed of the tracked units in radians per second, the carousel turns as one"""
+        speeds: list[float] = [track.angular_velocity for track in self.tracks if track.samples]
+        return float(np.median(speeds)) if speeds else 0.0
+
+    def predict(self, track: Track, lead: float) -> tuple[float, float]:
+        """Where the unit will be after lead seconds, rotated around the carousel center"""
+        radius: float = math.dist((track.x_pos, track.y_pos), self.center)
+        angle: float = track.angle + self.angular_velocity() * lead
+        return self.center[0] + radius * math.cos(angle), self.center[1] + radius * math.sin(angle)
+
+    def best(self, scorer: CarouselScorer, tracks: list[Track]) -> Track | None:
+        """Returns the visible unit the comp wants most, None if none of them are recognized as useful"""
+        scored: list[tuple[float, int, Track]] = [
+            (scorer.score(track.label), -track.track_id, track)
+            for track in tracks
+            if track.confidence >= settings.CAROUSEL_TEMPLATE_CONFIDENCE
+        ]
+        scored = [entry for entry in scored if entry[0] > 0]
+        return max(scored, key=lambda entry: entry[:2])[2] if scored else None
+
+
+def get_champ_carousel() -> None:
+    """Walks to the most wanted carousel unit until the round label changes
+    Without a recognized unit the tactician walks to the center of the carousel like before"""
+    area: tuple = screen_coords.CAROUSEL_POS.get_coords()
+    center: tuple = screen_coords.CAROUSEL_LOC.get_coords()
+    tracker = CarouselTracker((center[0] - area[0], center[1] - area[1]))
+    scorer = CarouselScorer(comps.COMP)
+    round_ended = wait.region_changed(screen_coords.ROUND_POS.get_coords())
+    last_click: float = -math.inf
+    while not round_ended():
+        tracker.update(frame.current().region(area), perf_counter())
+        target = tracker.best(scorer, tracker.tracks)
+        if perf_counter() - last_click >= settings.CAROUSEL_CLICK_INTERVAL:
+            point: tuple = center
+            if target is not None:
+                x_pos, y_pos = tracker.predict(target, settings.CAROUSEL_LEAD)
+                point = (round(x_pos + area[0]), round(y_pos + area[1]))
+            mk_functions.right_click(point)
+            last_click = perf_counter()
+        sleep(0.05)
+    sleep(3)
+
+
+def analyse(frames, fps: float, area: tuple, center: tuple) -> None:
+    """Runs the tracker over recorded frames and prints the tracks and chosen unit every second"""
+    tracker = CarouselTracker((center[0] - area[0], center[1] - area[1]))
+    scorer = CarouselScorer(comps.COMP)
+    step: float = 1 / fps
+    time: float = 0.0
+    while time <= frames.end:
+        tracks: list[Track] = tracker.update(frame.crop(frames.frame_at(time), area), time)
+        if int(time) != int(time - step):
+            target: Track | None = tracker.best(scorer, tracks)
+            turning: float = math.degrees(tracker.angular_velocity())
+            print(f"  {time:6.1f}s tracks={len(tracker.tracks):<3} turning={turning:6.1f} deg/s "
+                  f"labels={sorted({track.label for track in tracks if track.label})} "
+                  f"target={target.label if target else None}")
+        time += step
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clip", help="Video of the game window or a directory of <milliseconds>.png frames")
+    parser.add_argument("--fps", type=float, default=30)
+    arguments = parser.parse_args()
+    source = Path(arguments.clip)
+    recorded = DirectoryFrames(source) if source.is_dir() else VideoFrames(source, arguments.fps)
+    analyse(recorded, arguments.fps, screen_coords.CAROUSEL_POS.get_coords(), screen_coords.CAROUSEL_LOC.get_coords())
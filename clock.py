@@ -0,0 +1,61 @@
+"""
+Time source used by the bot so waits can be skipped when replaying recorded games
+"""
+
+import time
+
+
+class RealClock:
+    """Wall clock time, sleeps block the thread"""
+
+    def sleep(self, seconds: float) -> None:
+        """Blocks for the seconds passed in"""
+        time.sleep(seconds)
+
+    def perf_counter(self) -> float:
+        """Returns a monotonic time in seconds"""
+        return time.perf_counter()
+
+
+class VirtualClock:
+    """Clock whose sleeps return immediately and move time forward instead
+    Time spent computing still counts, so a replay sees the frames it would have seen live minus the waiting"""
+
+    def __init__(self) -> None:
+        self.started_at: float = time.perf_counter()
+        self.slept: float = 0.0
+
+    def sleep(self, seconds: float) -> None:
+        """Advances the clock without blocking"""
+        self.slept += max(seconds, 0.0)
+
+    def perf_counter(self) -> float:
+        """Returns seconds since the clock was created including skipped sleeps"""
+        return time.perf_counter() - self.started_at + self.slept
+
+
+_clock: RealClock | VirtualClock = RealClock()
+_slept: list[float] = [0.0, 0]  # Seconds slept, sleep calls
+
+
+def set_clock(new_clock: RealClock | VirtualClock) -> None:
+    """Replaces the time source used by every module that imports from clock"""
+    global _clock  # pylint: disable=global-statement
+    _clock = new_clock
+
+
+def sleep(seconds: float) -> None:
+    """Sleeps on the active clock"""
+    _slept[0] += seconds
+    _slept[1] += 1
+    _clock.sleep(seconds)
+
+
+def slept() -> tuple[float, int]:
+    """Returns the total seconds slept and number of sleep calls since the bot started"""
+    return _slept[0], _slept[1]
+
+
+def perf_counter() -> float:
+    """Reads the active clock"""
+    return _clock.perf_counter()
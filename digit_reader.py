@@ -0,0 +1,110 @@
+"""
+Reads the gold counter and round label digits without Tesseract
+A crop is thresholded, split into glyphs with connected components and every glyph is correlated against
+templates of the game's digit font in a single matrix product
+Templates are built offline from crops labelled with their full text: python digit_reader.py <crops> <output .npz>
+e.g. 50_1.png or 3-2_4.png, glyphs are labelled by position when the crop splits into as many glyphs as characters
+"""
+
+import argparse
+from pathlib import Path
+import cv2
+import numpy as np
+import settings
+from template_matcher import TemplateBank
+
+GLYPH_SIZE: tuple[int, int] = (8, 12)
+MIN_GLYPH_AREA: int = 3
+
+
+def binarize_digits(image: np.ndarray) -> np.ndarray:
+    """Otsu thresholds an RGB or gray crop so the glyphs are 1, flipping it if the background came out as 1"""
+    if image.ndim == 3:
+        image = cv2.cvtColor(np.ascontiguousarray(image[..., :3]), cv2.COLOR_RGB2GRAY)
+    binary: np.ndarray = cv2.threshold(image, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    return 1 - binary if np.count_nonzero(binary) * 2 > binary.size else binary
+
+
+def segment(binary: np.ndarray) -> list[np.ndarray]:
+    """Splits a binarized line into glyph crops ordered left to right
+    Components that overlap horizontally are one glyph, every crop spans the full height of the line's ink so
+    short glyphs like - keep their position relative to the digits"""
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    boxes: list[list[int]] = sorted(
+        [int(x_pos), int(y_pos), int(x_pos + width), int(y_pos + height)]
+        for x_pos, y_pos, width, height, area in stats[1:count]
+        if area >= MIN_GLYPH_AREA
+    )
+    merged: list[list[int]] = []
+    for box in boxes:
+        if merged and box[0] < merged[-1][2]:
+            merged[-1] = [merged[-1][0], min(merged[-1][1], box[1]), max(merged[-1][2], box[2]),
+                          max(merged[-1][3], box[3])]
+        else:
+            merged.append(box)
+    if not merged:
+        return []
+    top: int = min(box[1] for box in merged)
+    bottom: int = max(box[3] for box in merged)
+    return [binary[top:bottom, box[0]:box[2]] for box in merged]
+
+
+def glyph_vectors(glyphs: list[np.ndarray], size: tuple[int, int] = GLYPH_SIZE) -> np.ndarray:
+    """Resizes glyph crops to size (width, height) and returns them as zero mean unit vectors, one per row"""
+    vectors: np.ndarray = np.stack([
+        cv2.resize(np.pad(glyph, 1).astype(np.float32), size, interpolation=cv2.INTER_AREA).reshape(-1)
+        for glyph in glyphs
+    ])
+    vectors -= vectors.mean(axis=1, keepdims=True)
+    norms: np.ndarray = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+class DigitReader:  # pylint: disable=too-few-public-methods
+    """Classifies the glyphs of a digit crop against a bank of digit templates"""
+
+    def __init__(self, bank: TemplateBank) -> None:
+        self.bank: TemplateBank = bank
+
+    def read(self, image: np.ndarray) -> tuple[str, float]:
+        """Returns the text of the crop and the score of its least certain glyph, ("", 0.0) if it can't be read"""
+        if not self.bank.names:
+            return "", 0.0
+        glyphs: list[np.ndarray] = segment(binarize_digits(image))
+        if not glyphs:
+            return "", 0.0
+        scores: np.ndarray = glyph_vectors(glyphs, self.bank.size) @ self.bank.templates.T
+        best: np.ndarray = np.argmax(scores, axis=1)
+        text: str = "".join(self.bank.names[index] for index in best)
+        return text, min(max(float(scores[np.arange(len(best)), best].min()), 0.0), 1.0)
+
+
+def build(directory: str, size: tuple[int, int] = GLYPH_SIZE) -> TemplateBank:
+    """Builds a glyph bank from crops labelled with their text, glyphs sharing a character are averaged"""
+    grouped: dict[str, list[np.ndarray]] = {}
+    for path in sorted(Path(directory).rglob("*.png")):
+        label: str = path.stem.split("_")[0]
+        glyphs: list[np.ndarray] = segment(binarize_digits(cv2.cvtColor(cv2.imread(str(path)), cv2.COLOR_BGR2RGB)))
+        if len(glyphs) != len(label):
+            print(f"Skipping {path.name}, found {len(glyphs)} glyphs for {len(label)} characters")
+            continue
+        for character, vector in zip(label, glyph_vectors(glyphs, size)):
+            grouped.setdefault(character, []).append(vector)
+    if not grouped:
+        return TemplateBank.empty(size)
+    templates: np.ndarray = np.stack([np.mean(vectors, axis=0) for vectors in grouped.values()])
+    templates /= np.maximum(np.linalg.norm(templates, axis=1, keepdims=True), 1e-6)
+    return TemplateBank(list(grouped), templates.astype(np.float32), size)
+
+
+READER = DigitReader(TemplateBank.load(settings.DIGIT_TEMPLATES_PATH, GLYPH_SIZE))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("crops", help="Directory of .png crops named by their text")
+    parser.add_argument("output", help="Path of the .npz bank to write")
+    arguments = parser.parse_args()
+    built: TemplateBank = build(arguments.crops)
+    built.save(arguments.output)
+    print(f"Saved {len(built.names)} glyph templates to {arguments.output}")
@@ -0,0 +1,121 @@
+"""
+Captures the whole game window once and shares that screenshot with every screen reader
+A frame is reused until input is sent through mk_functions or it is older than settings.FRAME_MAX_AGE,
+each screen context keeps its own frame
+When a frame ring is set every full capture that fits its slots is also published to it for other processes
+"""
+
+import threading
+from typing import Callable
+import cv2
+import numpy as np
+from PIL import Image, ImageGrab
+from clock import perf_counter
+from frame_ring import FrameRing
+import screen_context
+import screen_coords
+import settings
+import telemetry
+
+
+class Frame:
+    """Single screenshot of the game window that hands out views of screen coordinate regions"""
+
+    def __init__(self, array: np.ndarray, origin: tuple, captured_at: float) -> None:
+        self.array: np.ndarray = array
+        self.origin: tuple = origin
+        self.captured_at: float = captured_at
+
+    def region(self, coords: tuple) -> np.ndarray:
+        """Returns a zero-copy view of the (x, y, x+w, y+h) screen coordinates passed in"""
+        return crop(self.array, (coords[0] - self.origin[0], coords[1] - self.origin[1],
+                                 coords[2] - self.origin[0], coords[3] - self.origin[1]))
+
+    def image(self, coords: tuple) -> Image.Image:
+        """Returns the screen coordinates passed in as a PIL image"""
+        return Image.fromarray(self.region(coords))
+
+    def age(self) -> float:
+        """Seconds since the frame was captured"""
+        return perf_counter() - self.captured_at
+
+
+def grab_screen(coords: tuple) -> np.ndarray:
+    """Screenshots the (x, y, x+w, y+h) screen coordinates as an RGB array"""
+    return np.asarray(ImageGrab.grab(bbox=coords))[..., :3]
+
+
+_lock = threading.Lock()
+_frames: dict[screen_context.ScreenContext, Frame] = {}  # Game windows never read each other's captures
+_screen_source: Callable[[tuple], np.ndarray] = grab_screen
+_frame_ring: FrameRing | None = None  # pylint: disable=invalid-name
+_ring_misfits: set[tuple[int, int]] = set()  # Frame sizes already reported as too big for the ring
+
+
+def crop(array: np.ndarray, coords: tuple) -> np.ndarray:
+    """Slices (x, y, x+w, y+h) coordinates out of an image array without copying"""
+    return array[max(coords[1], 0):max(coords[3], 0), max(coords[0], 0):max(coords[2], 0)]
+
+
+def difference_hash(image: np.ndarray, size: tuple[int, int] = (16, 8)) -> np.ndarray:
+    """Perceptual difference hash, a boolean array of whether each pixel is brighter than its right neighbour"""
+    grayscale: np.ndarray = cv2.cvtColor(np.ascontiguousarray(image), cv2.COLOR_RGB2GRAY)
+    resized: np.ndarray = cv2.resize(grayscale, (size[0] + 1, size[1]), interpolation=cv2.INTER_AREA)
+    return resized[:, 1:] > resized[:, :-1]
+
+
+def grab() -> Frame:
+    """Takes a new screenshot of the game window"""
+    window: tuple = screen_coords.GAME_WINDOW_POS.get_coords()
+    telemetry.count("screen_grabs")
+    captured = Frame(_screen_source(window), window[:2], perf_counter())
+    if _frame_ring is not None:
+        if _frame_ring.fits(captured.array):
+            _frame_ring.publish(captured.array, captured.origin, captured.captured_at)
+        else:
+            telemetry.count("frame_ring_skipped")
+            height, width = captured.array.shape[:2]
+            if (height, width) not in _ring_misfits:
+                _ring_misfits.add((height, width))
+                print(f"  [!] {width}x{height} frames don't fit the frame ring, raise settings.FRAME_RING_SHAPE")
+    return captured
+
+
+def current() -> Frame:
+    """Returns the shared frame, capturing a new one if it was invalidated or went stale"""
+    context: screen_context.ScreenContext = screen_context.current()
+    with _lock:
+        captured: Frame | None = _frames.get(context)
+        if captured is None or captured.age() > settings.FRAME_MAX_AGE:
+            captured = _frames[context] = grab()
+        return captured
+
+
+def peek(coords: tuple) -> np.ndarray:
+    """Returns a region from the shared frame while it is fresh, otherwise grabs only that region
+    Used by pollers that watch a small area and shouldn't pay for a full window capture every tick"""
+    with _lock:
+        captured: Frame | None = _frames.get(screen_context.current())
+        if captured is not None and captured.age() <= settings.FRAME_MAX_AGE:
+            return captured.region(coords)
+    telemetry.count("screen_grabs")
+    return _screen_source(coords)
+
+
+def set_screen_source(source: Callable[[tuple], np.ndarray]) -> None:
+    """Replaces where screenshots come from, e.g. recorded frames when replaying a game"""
+    global _screen_source  # pylint: disable=global-statement
+    _screen_source = source
+    invalidate()
+
+
+def set_frame_ring(ring: FrameRing | None) -> None:
+    """Publishes every full capture to the ring passed in, None stops publishing"""
+    global _frame_ring  # pylint: disable=global-statement
+    _frame_ring = ring
+
+
+def invalidate() -> None:
+    """Drops the shared frames so the next reader captures the screen again"""
+    with _lock:
+        _frames.clear()
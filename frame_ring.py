@@ -0,0 +1,147 @@
+"""
+Ring buffer of full-window frames in shared memory so other processes can read the bot's screenshots
+The capturing process publishes frames, readers in any process attach by name and get zero-copy views
+Every slot carries the sequence number of the frame in it, a reader checks it again after using a view to
+know whether the frame was overwritten while it was being read
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+import numpy as np
+
+_HEADER_FIELDS: int = 4  # slots, max height, max width, last published sequence
+_RECORD_FIELDS: int = 5  # sequence, origin x, origin y, height, width
+_WRITING: int = -1
+
+
+@dataclass
+class RingFrame:
+    """A published frame, array is a view into the shared slot and is only valid while the slot isn't reused"""
+
+    sequence: int
+    array: np.ndarray
+    origin: tuple
+    captured_at: float
+    ring: "FrameRing"
+    slot: int
+
+    def valid(self) -> bool:
+        """Checks if the slot still holds this frame, call after reading the view to detect a torn read"""
+        return int(self.ring.records[self.slot, 0]) == self.sequence
+
+
+class FrameRing:
+    """Fixed number of RGB frame slots laid out as a header, per slot records and capture times, then pixels"""
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool) -> None:
+        self.memory = memory
+        self.owner: bool = owner
+        self.header: np.ndarray = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=memory.buf)
+        self.slots, height, width = (int(value) for value in self.header[:3])
+        offset: int = self.header.nbytes
+        self.records: np.ndarray = np.ndarray((self.slots, _RECORD_FIELDS), dtype=np.int64, buffer=memory.buf,
+                                              offset=offset)
+        offset += self.records.nbytes
+        self.times: np.ndarray = np.ndarray((self.slots,), dtype=np.float64, buffer=memory.buf, offset=offset)
+        offset += self.times.nbytes
+        self.pixels: np.ndarray = np.ndarray((self.slots, height, width, 3), dtype=np.uint8, buffer=memory.buf,
+                                             offset=offset)
+
+    @classmethod
+    def create(cls, max_shape: tuple[int, int], slots: int, name: str | None = None) -> "FrameRing":
+        """Allocates a ring for frames up to (height, width) pixels"""
+        size: int = (8 * (_HEADER_FIELDS + slots * (_RECORD_FIELDS + 1))
+                     + slots * max_shape[0] * max_shape[1] * 3)
+        memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header: np.ndarray = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=memory.buf)
+        header[:] = (slots, max_shape[0], max_shape[1], 0)
+        del header
+        ring = cls(memory, owner=True)
+        ring.records[:, 0] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> "FrameRing":
+        """Opens a ring created by another process"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        """Shared memory name to pass to other processes"""
+        return self.memory.name
+
+    @property
+    def head(self) -> int:
+        """Sequence number of the last published frame, 0 before the first one"""
+        return int(self.header[3])
+
+    def fits(self, array: np.ndarray) -> bool:
+        """Checks if a frame is small enough for the ring's slots"""
+        return array.shape[0] <= self.pixels.shape[1] and array.shape[1] <= self.pixels.shape[2]
+
+    def publish(self, array: np.ndarray, origin: tuple, captured_at: float) -> int:
+        """Copies a frame into the oldest slot and returns its sequence number, only one process may publish"""
+        height, width = array.shape[:2]
+        if not self.fits(array):
+            raise ValueError(f"Frame of {width}x{height} doesn't fit the ring's "
+                             f"{self.pixels.shape[2]}x{self.pixels.shape[1]} slots")
+        sequence: int = self.head + 1
+        slot: int = sequence % self.slots
+        self.records[slot, 0] = _WRITING
+        self.pixels[slot, :height, :width] = array[..., :3]
+        self.records[slot, 1:] = (origin[0], origin[1], height, width)
+        self.times[slot] = captured_at
+        self.records[slot, 0] = sequence
+        self.header[3] = sequence
+        return sequence
+
+    def get(self, sequence: int) -> RingFrame | None:
+        """Returns the frame with the sequence number passed in, None if it was overwritten or not published yet"""
+        slot: int = sequence % self.slots
+        if sequence <= 0 or int(self.records[slot, 0]) != sequence:
+            return None
+        _, origin_x, origin_y, height, width = (int(value) for value in self.records[slot])
+        found = RingFrame(sequence, self.pixels[slot, :height, :width], (origin_x, origin_y),
+                          float(self.times[slot]), self, slot)
+        return found if found.valid() else None
+
+    def latest(self) -> RingFrame | None:
+        """Returns the newest frame"""
+        return self.get(self.head)
+
+    def close(self) -> None:
+        """Detaches from the ring, the creating process also frees it"""
+        del self.header, self.records, self.times, self.pixels
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+class RingReader:
+    """Cursor over a ring that hands out each frame once and counts frames it fell too far behind to read"""
+
+    def __init__(self, ring: FrameRing) -> None:
+        self.ring: FrameRing = ring
+        self.cursor: int = ring.head
+        self.dropped: int = 0
+
+    def next(self) -> RingFrame | None:
+        """Returns the oldest unread frame that is still in the ring, None once the reader is caught up"""
+        head: int = self.ring.head
+        while self.cursor < head:
+            self.cursor += 1
+            if self.cursor <= head - self.ring.slots:
+                self.dropped += head - self.ring.slots - self.cursor + 1
+                self.cursor = head - self.ring.slots + 1
+            found: RingFrame | None = self.ring.get(self.cursor)
+            if found is not None:
+                return found
+            self.dropped += 1
+        return None
+
+    def latest(self) -> RingFrame | None:
+        """Skips to the newest frame, counting the ones passed over as dropped"""
+        head: int = self.ring.head
+        self.dropped += max(head - self.cursor - 1, 0)
+        self.cursor = head
+        return self.ring.get(head)
@@ -2,34 +2,52 @@
 Handles tasks that happen each game round
 """
 
-from time import sleep, perf_counter
 import random
 import multiprocessing
-import importlib
-from win32con import BM_CLICK
-import win32gui
+from clock import sleep, perf_counter
 import settings
 import arena_functions
-import game_assets
+import carousel
 import game_functions
+import mk_functions
+import orb_pickup
+import telemetry
 from arena import Arena
-from vec4 import Vec4
+from round_schedule import DEFAULT_SCHEDULE, RoundFlag, RoundSchedule, parse_round
+from round_watcher import RoundChange, RoundWatcher
+from vec4 import Vec4, GameWindow
 from vec2 import Vec2
 
+try:
+    from win32con import BM_CLICK
+    import win32gui
+except ImportError:  # Replays run headless on machines without the Windows API
+    BM_CLICK = None
+    win32gui = None
 
-class Game:
+
+class Game:  # pylint: disable=too-many-instance-attributes
     """Game class that handles game logic such as round tasks"""
 
-    def __init__(self, message_queue: multiprocessing.Queue) -> None:
-        importlib.reload(game_assets)
+    def __init__(self, message_queue: multiprocessing.Queue, window: GameWindow | None = None) -> None:
+        telemetry.reset()
         self.message_queue = message_queue
         self.arena = Arena(self.message_queue)
         self.round: list[str, int] = ["0-0", 0]
+        self.round_watcher = RoundWatcher(game_functions.get_round)
+        self.schedule: RoundSchedule = DEFAULT_SCHEDULE
+        self.stage_round: tuple[int, int] = (0, 0)
+        self.checked_stages: set[int] = set()
         self.time: None = None
         self.forfeit_time: int = settings.FORFEIT_TIME + random.randint(50, 150)
         self.found_window = False
 
-        print("\n[!] Searching for game window")
+        if window is not None:
+            Vec4.setup_screen(window.x_pos, window.y_pos, window.width, window.height)
+            Vec2.setup_screen(window.x_pos, window.y_pos, window.width, window.height)
+            self.found_window = True
+        else:
+            print("\n[!] Searching for game window")
         while not self.found_window:
             print("  Did not find window, trying again...")
             win32gui.EnumWindows(self.callback, None)
@@ -71,6 +89,8 @@ class Game:
 
     def check_failed_to_connect_window(self) -> bool:
         """Check "Failed to Connect" windows and try to reconnect"""
+        if win32gui is None:
+            return False
         hwnd = win32gui.FindWindow(None, "Failed to Connect")
         if hwnd:
             print(' Found "Failed to Connect" window, trying to exit and reconnect')
@@ -86,10 +106,8 @@ class Game:
                 print("  Reconnect button not found.")
         return False
 
-    # pylint: disable=too-many-branches
     def game_loop(self) -> None:
         """Loop that runs while the game is active, handles calling the correct tasks for round and exiting game"""
-        ran_round: str = None
         last_game_health: int = 100
 
         while True:
@@ -109,7 +127,7 @@ class Game:
                 break
             last_game_health = game_health
 
-            self.round = game_functions.get_round()
+            round_change: RoundChange | None = self.round_watcher.poll()
 
             if (
                 settings.FORFEIT
@@ -118,90 +136,57 @@ class Game:
                 game_functions.forfeit()
                 continue
 
-            if self.round[0] != ran_round:
-                if self.round[0] in game_assets.PVP_ROUND:
-                    game_functions.default_pos()
-                    self.pvp_round()
-                    ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.PVE_ROUND:
-                    game_functions.default_pos()
-                    self.pve_round()
-                    ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.CAROUSEL_ROUND:
-                    self.carousel_round()
-                    ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.SECOND_ROUND:
-                    self.second_round()
-                    ran_round: str = self.round[0]
-                elif self.round[0] in game_assets.ENCOUNTER_ROUNDS:
-                    print(f"\n[Encounter Round] {self.round[0]}")
-                    print("  Do nothing")
-                    self.message_queue.put("CLEAR")
-                    self.arena.check_health()
-                    ran_round: str = self.round[0]
-                if self.round[1] == 1 and self.round[0].split("-")[1] == "1":
-                    print("\n[Encounter round setup]")
-                    self.encounter_round_setup()
-            sleep(0.5)
+            if round_change is not None:
+                # Carousels, encounters and the round reset move the tactician without a right click
+                mk_functions.forget_last_move()
+                self.round = round_change.current
+                self.stage_round = parse_round(self.round[0])
+                self.dispatch_round()
+                telemetry.flush_round(self.round[0])
+            sleep(settings.ROUND_POLL_INTERVAL)
+
+        print("\n[Game latency summary]")
+        print(telemetry.summary())
+
+    def dispatch_round(self) -> None:
+        """Runs the tasks for the round that just started"""
+        flags: RoundFlag = self.schedule.flags(*self.stage_round)
+        if flags & RoundFlag.PVP:
+            game_functions.default_pos()
+            self.pvp_round()
+        elif flags & RoundFlag.PVE:
+            game_functions.default_pos()
+            self.pve_round()
+        elif flags & RoundFlag.CAROUSEL:
+            self.carousel_round()
+        elif flags & RoundFlag.SECOND:
+            self.second_round()
+        elif flags & RoundFlag.ENCOUNTER:
+            print(f"\n[Encounter Round] {self.round[0]}")
+            print("  Do nothing")
+            self.message_queue.put("CLEAR")
+            self.arena.check_health()
+        if self.round[1] == 1 and self.stage_round[1] == 1:
+            print("\n[Encounter round setup]")
+            self.encounter_round_setup()
 
+    def round_has(self, flag: RoundFlag) -> bool:
+        """Checks the current round's flags in the round schedule"""
+        return bool(self.schedule.flags(*self.stage_round) & flag)
+
+    @telemetry.traced()
     def encounter_round_setup(self) -> None:
-        """Remove rounds from game_assets and add it back by checking round message"""
-        game_assets.CAROUSEL_ROUND = {
-            carousel_round
-            for carousel_round in game_assets.CAROUSEL_ROUND
-            if not carousel_round.startswith(self.round[0].split("-")[0])
-        }
-        game_assets.PVE_ROUND = {
-            pve_round
-            for pve_round in game_assets.PVE_ROUND
-            if not pve_round.startswith(self.round[0].split("-")[0])
-        }
-        game_assets.PVP_ROUND = {
-            pvp_round
-            for pvp_round in game_assets.PVP_ROUND
-            if not pvp_round.startswith(self.round[0].split("-")[0])
-        }
-        game_assets.ANVIL_ROUNDS = {
-            anvil_round
-            for anvil_round in game_assets.ANVIL_ROUNDS
-            if not anvil_round.startswith(self.round[0].split("-")[0])
-        }
-        game_assets.ITEM_PLACEMENT_ROUNDS = {
-            item_placement_round
-            for item_placement_round in game_assets.ITEM_PLACEMENT_ROUNDS
-            if not item_placement_round.startswith(self.round[0].split("-")[0])
-        }
-        for index, round_msg in enumerate(game_functions.check_encounter_round()):
-            print(f"  Round {self.round[0].split('-')[0]}-{str(index + 1)}: {round_msg.upper()} ROUND")
-            if index == 0:
-                continue
-            if round_msg == "carousel":
-                game_assets.CAROUSEL_ROUND.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 1)
-                )
-                game_assets.ANVIL_ROUNDS.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 2)
-                )
-                game_assets.ITEM_PLACEMENT_ROUNDS.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 2)
-                )
-            elif round_msg == "pve":
-                game_assets.PVE_ROUND.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 1)
-                )
-            elif round_msg == "pvp":
-                game_assets.PVP_ROUND.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 1)
-                )
-            elif round_msg == "encounter":
-                game_assets.ENCOUNTER_ROUNDS.add(
-                    self.round[0].split("-")[0] + "-" + str(index + 1)
-                )
-                if index+1 == 2 and 3 <= int(self.round[0].split("-")[0]) <= 4:
-                    game_assets.AUGMENT_ROUNDS.add(
-                        self.round[0].split("-")[0] + "-" + str(index + 2)
-                    )
+        """Rebuilds the stage in the round schedule from the stage icons, once per stage"""
+        stage: int = self.stage_round[0]
+        if stage in self.checked_stages:
+            return
+        self.checked_stages.add(stage)
+        round_types: list[str] = game_functions.check_encounter_round()
+        for index, round_msg in enumerate(round_types):
+            print(f"  Round {stage}-{index + 1}: {round_msg.upper()} ROUND")
+        self.schedule = self.schedule.with_stage(stage, round_types)
 
+    @telemetry.traced()
     def second_round(self) -> None:
         """Move unknown champion to board after first carousel"""
         print(f"\n[Second Round] {self.round[0]}")
@@ -215,6 +200,7 @@ class Game:
             self.arena.move_unknown()
         self.end_round_tasks()
 
+    @telemetry.traced()
     def carousel_round(self) -> None:
         """Handles tasks for carousel rounds"""
         print(f"\n[Carousel Round] {self.round[0]}")
@@ -223,19 +209,18 @@ class Game:
             self.arena.final_comp = True
         self.arena.check_health()
         print("  Getting a champ from the carousel")
-        game_functions.get_champ_carousel(self.round[0])
+        carousel.get_champ_carousel()
 
+    @telemetry.traced()
     def pve_round(self) -> None:
         """Handles tasks for PVE rounds"""
         print(f"\n[PvE Round] {self.round[0]}")
         self.message_queue.put("CLEAR")
         sleep(0.5)
-        if self.round[0] in game_assets.AUGMENT_ROUNDS:
+        if self.round_has(RoundFlag.AUGMENT):
             sleep(1)
             self.arena.augment_roll = True
             self.arena.pick_augment()
-            # Can't purchase champions for a short period after choosing augment
-            sleep(2.5)
         if self.round[0] == "1-3":
             sleep(1.5)
             self.arena.fix_unknown()
@@ -254,34 +239,34 @@ class Game:
         self.arena.bench_cleanup()
         self.end_round_tasks()
 
+    @telemetry.traced()
     def pvp_round(self) -> None:
         """Handles tasks for PVP rounds"""
         print(f"\n[PvP Round] {self.round[0]}")
         self.message_queue.put("CLEAR")
         sleep(0.5)
-        if self.round[0] in game_assets.AUGMENT_ROUNDS:
+        if self.round_has(RoundFlag.AUGMENT):
             sleep(1)
             self.arena.augment_roll = True
             self.arena.pick_augment()
-            sleep(2.5)
         if self.round[0] in ("2-1", "2-5"):
             self.arena.buy_xp_round()
-        if self.round[0] in game_assets.PICKUP_ROUNDS:
+        if self.round_has(RoundFlag.PICKUP):
             print("  Picking up items")
-            game_functions.pickup_items()
+            orb_pickup.pickup_items()
 
         self.arena.fix_bench_state()
         self.arena.bench_cleanup()
-        if self.round[0] in game_assets.ANVIL_ROUNDS:
+        if self.round_has(RoundFlag.ANVIL):
             self.arena.clear_anvil()
-        self.arena.spend_gold(speedy=self.round[0] in game_assets.PICKUP_ROUNDS)
+        self.arena.spend_gold(speedy=self.round_has(RoundFlag.PICKUP))
         self.arena.move_champions()
         self.arena.replace_unknown()
         if self.arena.final_comp:
             self.arena.final_comp_check()
         self.arena.bench_cleanup()
 
-        if self.round[0] in game_assets.ITEM_PLACEMENT_ROUNDS:
+        if self.round_has(RoundFlag.ITEM_PLACEMENT):
             sleep(1)
             self.arena.place_items()
         self.end_round_tasks()
@@ -2,77 +2,78 @@
 Functions used by the Game class to retrieve relevant data
 """
 
-from time import sleep
-from PIL import ImageGrab
+import numpy as np
+from clock import sleep
+import digit_reader
+import frame
 import screen_coords
 import ocr
 import game_assets
 import mk_functions
+import settings
+from template_matcher import TemplateBank
+from vec4 import Vec4
+
+STAGE_ICON_TEMPLATES: TemplateBank = TemplateBank.load(settings.STAGE_ICON_TEMPLATES_PATH, (12, 12), color=True)
+
+ROUND_LAYOUTS: dict[int, Vec4] = {
+    3: screen_coords.ROUND_POS_THREE,
+    2: screen_coords.ROUND_POS_TWO,
+    1: screen_coords.ROUND_POS_ONE,
+}
+
+
+def get_round(preferred_layout: int = 3) -> list[str, int]:
+    """Gets the current game round, the preferred label layout is read first
+    Each layout is read with the digit templates and only goes through Tesseract if they aren't sure"""
+    screen_capture = frame.current().image(screen_coords.ROUND_POS.get_coords())
+    for layout in sorted(ROUND_LAYOUTS, key=lambda option: option != preferred_layout):
+        round_crop = screen_capture.crop(ROUND_LAYOUTS[layout].get_coords())
+        game_round, confidence = digit_reader.READER.read(np.asarray(round_crop))
+        if game_round in game_assets.ROUNDS and confidence >= settings.DIGIT_CONFIDENCE:
+            return [game_round, layout]
+        game_round = ocr.get_text_from_image(image=round_crop, whitelist=ocr.ROUND_WHITELIST)
+        if game_round in game_assets.ROUNDS:
+            return [game_round, layout]
+    return ["999-999",0]
 
 
-def get_round() -> list[str, int]:
-    """Gets the current game round"""
-    screen_capture = ImageGrab.grab(bbox=screen_coords.ROUND_POS.get_coords())
-    round_three = screen_capture.crop(screen_coords.ROUND_POS_THREE.get_coords())
-    game_round: str = ocr.get_text_from_image(image=round_three, whitelist=ocr.ROUND_WHITELIST)
-    if game_round in game_assets.ROUNDS:
-        return [game_round, 3]
-
-    round_two = screen_capture.crop(screen_coords.ROUND_POS_TWO.get_coords())
-    game_round: str = ocr.get_text_from_image(image=round_two, whitelist=ocr.ROUND_WHITELIST)
-    if game_round in game_assets.ROUNDS:
-        return [game_round, 2]
-
-    round_one = screen_capture.crop(screen_coords.ROUND_POS_ONE.get_coords())
-    game_round: str = ocr.get_text_from_image(image=round_one, whitelist=ocr.ROUND_WHITELIST)
-    if game_round in game_assets.ROUNDS:
-        return [game_round, 1]
-    return ["999-999",0]
+def round_type(round_message: str) -> str:
+    """Turns a stage icon's tooltip text into carousel, encounter, pve or pvp"""
+    if any(keyword in round_message for keyword in ["Carousel"]):
+        return "carousel"
+    if any(keyword in round_message for keyword in ["Get pulled into an Encounter"]):
+        return "encounter"
+    if any(keyword in round_message for keyword in ["Krugs", "Murk Wolves", "Raptors", "Elder Dragon"]):
+        return "pve"
+    return "pvp"
 
 
 def check_encounter_round() -> list[str]:
-    """Get the game round list by checking round text for encounter add rounds"""
-    round_list: list = []
-    for positions in screen_coords.ROUND_ENCOUNTER_ICON_POS:
+    """Get the game round list by classifying the stage icons from one frame
+    Only icons the templates aren't sure about are hovered, their tooltips are read while the sweep continues"""
+    icons: frame.Frame = frame.current()
+    matches: list = STAGE_ICON_TEMPLATES.match_many(
+        [icons.region(box.get_coords()) for box in screen_coords.ROUND_ENCOUNTER_ICON_BOX]
+    )
+    round_list: list = [label if score >= settings.STAGE_ICON_CONFIDENCE else None for label, score in matches]
+    readers: dict = {}
+    for index, positions in enumerate(screen_coords.ROUND_ENCOUNTER_ICON_POS):
+        if round_list[index] is not None:
+            continue
         mk_functions.move_mouse(positions[0].get_coords())
-        round_message: str = ocr.get_text(
+        readers[index] = ocr.submit_text(
             screenxy=positions[1].get_coords(),
             scale=3,
             psm=7,
             whitelist=(ocr.ALPHABET_WHITELIST + " "),
         )
-        if any(keyword in round_message for keyword in ["Carousel"]):
-            round_list.append("carousel")
-        elif any(keyword in round_message for keyword in ["Get pulled into an Encounter"]):
-            round_list.append("encounter")
-        elif any(keyword in round_message for keyword in ["Krugs", "Murk Wolves", "Raptors", "Elder Dragon"]):
-            round_list.append("pve")
-        else:
-            round_list.append("pvp")
-    mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
+    if readers:
+        mk_functions.move_mouse(screen_coords.DEFAULT_LOC.get_coords())
+    for index, reader in readers.items():
+        round_list[index] = round_type(reader.result())
     return round_list
 
-def pickup_items() -> None:  # Refacor this function to make it more clear whats happening
-    """Picks up items from the board after PVP round"""
-    for index, coords in enumerate(screen_coords.ITEM_PICKUP_LOC):
-        mk_functions.right_click(coords.get_coords())
-        if index == 7:  # Don't need to sleep on final click
-            return
-        if index == 0:
-            sleep(1.2)
-        if index % 2 == 0:
-            sleep(2)
-        else:
-            sleep(1.2)
-
-
-def get_champ_carousel(tft_round: str) -> None:
-    """Gets a champion from the carousel"""
-    while tft_round == get_round()[0]:
-        mk_functions.right_click(screen_coords.CAROUSEL_LOC.get_coords())
-        sleep(0.7)
-    sleep(3)
-
 
 def check_alive() -> bool:    # Refactor this function to use API
     """Checks the screen to see if player is still alive"""
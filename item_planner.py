@@ -0,0 +1,149 @@
+"""
+Plans where every item on the item bench goes in one pass
+The component -> (champion, target item) index is built once from the comp and the item recipes
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+import game_assets
+from champion import Champion
+
+
+@dataclass
+class Placement:
+    """A single drag of a bench item onto a champion"""
+
+    item_index: int
+    item: str
+    champion: Champion
+    target: str
+    completes: bool
+    missing: str | None = None
+
+
+@dataclass
+class PlannedChampion:
+    """Item state of a board champion while a plan is being built"""
+
+    champion: Champion
+    build: list[str]
+    building: tuple[str, str] | None
+    completed: int
+    held: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.held = self.completed + (self.building is not None)
+
+    def needs_items(self) -> bool:
+        """Mirrors Champion.does_need_items for the planned state"""
+        return self.completed != 3 or len(self.build) + (self.building is not None) == 0
+
+    def can_start(self) -> bool:
+        """Checks if the champion has a free item slot and isn't already building an item"""
+        return self.building is None and self.held < 3 and self.needs_items()
+
+
+class ItemPlanner:
+    """Precomputed item recipes for the comp that turn the item bench into a batch of placements"""
+
+    def __init__(self, comp: dict) -> None:
+        self.priority: list[str] = list(comp)
+        self.recipes: dict[str, Counter] = {
+            full_item: Counter(components) for full_item, components in game_assets.FULL_ITEMS.items()
+        }
+        self.component_targets: dict[str, list[tuple[str, str]]] = {}
+        for champ_name, champion_data in comp.items():
+            for target in champion_data["items"]:
+                for component in self.recipes.get(target, ()):
+                    self.component_targets.setdefault(component, []).append((champ_name, target))
+
+    def plan(self, items: list[str | None], board: list[Champion]) -> list[Placement]:
+        """Returns the placements for the bench items that complete the most items, champions in comp order first
+        Full items go first, then components that finish an item in progress, then pairs of components that
+        build a whole item, then single components that start one"""
+        on_board: dict[str, Champion] = {champion.name: champion for champion in board}
+        champions: list[PlannedChampion] = [
+            PlannedChampion(
+                champion=on_board[name],
+                build=list(on_board[name].build),
+                building=on_board[name].current_building[0] if on_board[name].current_building else None,
+                completed=len(on_board[name].completed_items),
+            )
+            for name in self.priority
+            if name in on_board
+        ]
+        bench: dict[int, str] = {index: item for index, item in enumerate(items) if item is not None}
+        return (self.place_full_items(bench, champions) + finish_items(bench, champions)
+                + self.build_pairs(bench, champions) + self.start_items(bench, champions))
+
+    def place_full_items(self, bench: dict[int, str], champions: list[PlannedChampion]) -> list[Placement]:
+        """Gives full items on the bench to the first champion whose build has them"""
+        placements: list[Placement] = []
+        for index, item in list(bench.items()):
+            if item not in self.recipes:
+                continue
+            planned: PlannedChampion | None = next(
+                (planned for planned in champions if item in planned.build and planned.needs_items()), None
+            )
+            if planned is not None:
+                del bench[index]
+                planned.build.remove(item)
+                planned.completed += 1
+                planned.held += 1
+                placements.append(Placement(index, item, planned.champion, item, True))
+        return placements
+
+    def build_pairs(self, bench: dict[int, str], champions: list[PlannedChampion]) -> list[Placement]:
+        """Places both components of an item the bench holds a whole recipe for"""
+        placements: list[Placement] = []
+        available: Counter = Counter(bench.values())
+        for planned in champions:
+            for target in list(planned.build):
+                recipe: Counter | None = self.recipes.get(target)
+                if not planned.can_start() or recipe is None or recipe - available:
+                    continue
+                first, second = sorted(recipe.elements())
+                placements.append(Placement(take(bench, first), first, planned.champion, target, False, second))
+                placements.append(Placement(take(bench, second), second, planned.champion, target, True))
+                available -= recipe
+                planned.build.remove(target)
+                planned.completed += 1
+                planned.held += 1
+        return placements
+
+    def start_items(self, bench: dict[int, str], champions: list[PlannedChampion]) -> list[Placement]:
+        """Places single components that start an item, the champion then waits for the missing component"""
+        placements: list[Placement] = []
+        by_name: dict[str, PlannedChampion] = {planned.champion.name: planned for planned in champions}
+        for index, component in list(bench.items()):
+            for champ_name, target in self.component_targets.get(component, ()):
+                planned: PlannedChampion | None = by_name.get(champ_name)
+                if planned is None or not planned.can_start() or target not in planned.build:
+                    continue
+                missing: str = next(iter(self.recipes[target] - Counter([component])))
+                del bench[index]
+                planned.build.remove(target)
+                planned.building = (target, missing)
+                planned.held += 1
+                placements.append(Placement(index, component, planned.champion, target, False, missing))
+                break
+        return placements
+
+
+def take(bench: dict[int, str], item: str) -> int | None:
+    """Removes the first bench slot holding the item and returns its index, None if the bench doesn't have it"""
+    index: int | None = next((index for index, bench_item in bench.items() if bench_item == item), None)
+    if index is not None:
+        del bench[index]
+    return index
+
+
+def finish_items(bench: dict[int, str], champions: list[PlannedChampion]) -> list[Placement]:
+    """Places the missing component of items champions are already building"""
+    placements: list[Placement] = []
+    for planned in champions:
+        if planned.building is not None and (index := take(bench, planned.building[1])) is not None:
+            placements.append(Placement(index, planned.building[1], planned.champion, planned.building[0], True))
+            planned.building = None
+            planned.completed += 1
+    return placements
@@ -0,0 +1,63 @@
+"""
+Client for the in-game Live Client Data API
+Keeps one keep-alive HTTPS session and serves every field read within settings.LIVE_CLIENT_TTL from one response
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+from clock import perf_counter
+import settings
+import telemetry
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+LIVE_CLIENT_URL = "https://127.0.0.1:2999/liveclientdata"
+
+
+class LiveClient:
+    """Pooled session to the Live Client Data API with a short lived snapshot per endpoint"""
+
+    def __init__(self, base_url: str = LIVE_CLIENT_URL, ttl: float = settings.LIVE_CLIENT_TTL,
+                 timeout: float = 10, verify: bool | str = False) -> None:
+        self.base_url: str = base_url.rstrip("/")
+        self.ttl: float = ttl
+        self.timeout: float = timeout
+        self.verify: bool | str = verify
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.snapshots: dict[str, tuple[float, dict]] = {}
+        self.lock = threading.Lock()
+
+    def fetch(self, endpoint: str) -> dict:
+        """Returns the endpoint's JSON, reusing the last response while it is younger than the TTL"""
+        with self.lock:
+            snapshot: tuple[float, dict] | None = self.snapshots.get(endpoint)
+            if snapshot is not None and perf_counter() - snapshot[0] <= self.ttl:
+                return snapshot[1]
+            telemetry.count("http_calls")
+            response = self.session.get(f"{self.base_url}/{endpoint}", timeout=self.timeout, verify=self.verify)
+            data: dict = response.json()
+            self.snapshots[endpoint] = (perf_counter(), data)
+            return data
+
+    def all_game_data(self) -> dict:
+        """Returns the full game data snapshot"""
+        return self.fetch("allgamedata")
+
+    def active_player(self) -> dict:
+        """Returns only the tactician's data, a much smaller response than allgamedata"""
+        return self.fetch("activeplayer")
+
+    def invalidate(self) -> None:
+        """Drops every cached snapshot so the next read goes to the API"""
+        with self.lock:
+            self.snapshots.clear()
+
+    def close(self) -> None:
+        """Closes the pooled connections"""
+        self.session.close()
+
+
+CLIENT = LiveClient()
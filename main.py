@@ -5,12 +5,16 @@ Where the bot execution starts & contains the game loop that keeps the bot runni
 import multiprocessing
 from ui import UI
 import auto_queue
+import frame
+from frame_ring import FrameRing
 from game import Game
 import settings
 
 
-def game_loop(ui_queue: multiprocessing.Queue) -> None:
+def game_loop(ui_queue: multiprocessing.Queue, frame_ring_name: str | None) -> None:
     """Keeps the program running indefinetly by calling queue and game start in a loop"""
+    if frame_ring_name is not None:
+        frame.set_frame_ring(FrameRing.attach(frame_ring_name))
     while True:
         auto_queue.queue()
         Game(ui_queue)
@@ -20,10 +24,18 @@ if __name__ == "__main__":
     if settings.LEAGUE_CLIENT_PATH is None:
         raise ValueError("No league client path specified. Please set the path in settings.py")
     message_queue = multiprocessing.Queue()
+    # Frames are only copied to shared memory when other processes are set up to read them
+    frame_ring: FrameRing | None = None
+    if settings.FRAME_RING_SLOTS:
+        frame_ring = FrameRing.create(settings.FRAME_RING_SHAPE, settings.FRAME_RING_SLOTS)
     overlay: UI = UI(message_queue)
-    game_thread = multiprocessing.Process(target=game_loop, args=(message_queue,))
+    game_thread = multiprocessing.Process(
+        target=game_loop, args=(message_queue, frame_ring.name if frame_ring is not None else None)
+    )
 
     print("TFT OCR | https://github.com/jfd02/TFT-OCR-BOT")
     print("Close this window to terminate the overlay window & program")
     game_thread.start()
     overlay.ui_loop()
+    if frame_ring is not None:
+        frame_ring.close()
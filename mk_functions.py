@@ -1,49 +1,89 @@
 """
 Handles sending input to the game, coords contain a cartesian ordered pair (x, y)
+Every input invalidates the shared screen frame since the game will redraw in response
+Input goes to pydirectinput unless another sink with the same moveTo/mouseDown/mouseUp/press methods is set
 """
 
 import random
-import pydirectinput
+import frame
+
+_input_sink = None  # pylint: disable=invalid-name
+_last_move: tuple | None = None  # pylint: disable=invalid-name
+
+
+def set_input_sink(sink) -> None:
+    """Replaces where input is sent, e.g. a recorder when replaying a game"""
+    global _input_sink  # pylint: disable=global-statement
+    _input_sink = sink
+
+
+def input_sink():
+    """Returns the active input sink, pydirectinput is only imported when input is first sent"""
+    global _input_sink  # pylint: disable=global-statement
+    if _input_sink is None:
+        import pydirectinput  # pylint: disable=import-outside-toplevel
+        _input_sink = pydirectinput
+    return _input_sink
 
 
 def left_click(coords: tuple) -> None:
     """Left clicks at argument ones coordinates"""
     offset: int = random.randint(-3, 3)
-    pydirectinput.moveTo(coords[0] - offset, coords[1] - offset)
-    pydirectinput.mouseDown()
-    pydirectinput.mouseUp()
+    input_sink().moveTo(coords[0] - offset, coords[1] - offset)
+    input_sink().mouseDown()
+    input_sink().mouseUp()
+    frame.invalidate()
 
 
 def right_click(coords: tuple) -> None:
-    """Right clicks at argument ones coordinates"""
+    """Right clicks at argument ones coordinates, which sends the tactician there"""
+    global _last_move  # pylint: disable=global-statement
+    _last_move = (coords[0], coords[1])
     offset: int = random.randint(-3, 3)
-    pydirectinput.moveTo(coords[0] - offset, coords[1] - offset)
-    pydirectinput.mouseDown(button="right")
-    pydirectinput.mouseUp(button="right")
+    input_sink().moveTo(coords[0] - offset, coords[1] - offset)
+    input_sink().mouseDown(button="right")
+    input_sink().mouseUp(button="right")
+    frame.invalidate()
+
+
+def last_move() -> tuple | None:
+    """Returns where the tactician was last sent, None if it hasn't been moved"""
+    return _last_move
+
+
+def forget_last_move() -> None:
+    """Forgets where the tactician was sent, the game moves it back to its board when a round starts"""
+    global _last_move  # pylint: disable=global-statement
+    _last_move = None
 
 
 def press_e(coords: tuple) -> None:
     """Presses e at argument ones coordinates"""
     offset: int = random.randint(-3, 3)
-    pydirectinput.moveTo(coords[0] - offset, coords[1] - offset)
-    pydirectinput.press("e")
+    input_sink().moveTo(coords[0] - offset, coords[1] - offset)
+    input_sink().press("e")
+    frame.invalidate()
 
 
 def move_mouse(coords: tuple) -> None:
     """Moves mouse to argument ones coordinates"""
-    pydirectinput.moveTo(coords[0], coords[1])
+    input_sink().moveTo(coords[0], coords[1])
+    frame.invalidate()
 
 
 def buy_xp() -> None:
     """Presses hotkey to purchase XP"""
-    pydirectinput.press("f")
+    input_sink().press("f")
+    frame.invalidate()
 
 
 def reroll() -> None:
     """Presses hotkey to purchase reroll"""
-    pydirectinput.press("d")
+    input_sink().press("d")
+    frame.invalidate()
 
 
 def press_esc() -> None:
     """Presses escape key"""
-    pydirectinput.press("esc")
+    input_sink().press("esc")
+    frame.invalidate()
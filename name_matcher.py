@@ -0,0 +1,97 @@
+"""
+Resolves noisy OCR strings to canonical champion and item names
+Names are indexed by character trigrams once, candidates sharing trigrams with the OCR text are
+verified with an insert/delete distance that stops as soon as it can no longer reach the threshold
+Scores are 2 * longest common subsequence / total length, the ratio difflib.SequenceMatcher approximates,
+so the thresholds used with SequenceMatcher keep their meaning
+"""
+
+from collections import Counter
+
+GRAM_SIZE = 3
+
+
+class NameIndex:
+    """Trigram inverted index over a fixed set of names"""
+
+    def __init__(self, names: set[str] | list[str] | dict) -> None:
+        self.names: list[str] = sorted(names)
+        self.exact: set[str] = set(self.names)
+        self.name_grams: list[set[str]] = [grams(name) for name in self.names]
+        self.postings: dict[str, list[int]] = {}
+        for name_index, name_grams in enumerate(self.name_grams):
+            for gram in name_grams:
+                self.postings.setdefault(gram, []).append(name_index)
+
+    def match(self, text: str, threshold: float, allow_substring: bool = False) -> tuple[str | None, float]:
+        """Returns the best (name, score) for the text or (None, 0.0) if no name reaches the threshold
+        Score is 2 * longest common subsequence / total length, names contained in the text score 1.0
+        when allow_substring is set"""
+        if text in self.exact:
+            return text, 1.0
+        if not text:
+            return None, 0.0
+
+        text_grams: set[str] = grams(text)
+        shared: Counter = Counter()
+        for gram in text_grams:
+            shared.update(self.postings.get(gram, ()))
+
+        if allow_substring:
+            contained: list[str] = [
+                self.names[name_index]
+                for name_index in shared
+                if self.names[name_index] in text
+            ]
+            if contained:
+                return max(contained, key=len), 1.0
+
+        return self.closest(text, text_grams, shared, threshold)
+
+    def closest(self, text: str, text_grams: set[str], shared: Counter, threshold: float) -> tuple[str | None, float]:
+        """Verifies the names sharing trigrams with the text, most shared first, by their bounded edit distance"""
+        best_name: str | None = None
+        best_score: float = threshold
+        # Names sharing no trigram can still be close enough when the strings are short
+        unshared: list[tuple[int, int]] = [(name_index, 0) for name_index in range(len(self.names))
+                                           if name_index not in shared]
+        for name_index, shared_count in shared.most_common() + unshared:
+            name: str = self.names[name_index]
+            total: int = len(name) + len(text)
+            max_distance: int = int((1 - best_score) * total + 1e-9)
+            # Every insert or delete removes at most GRAM_SIZE distinct trigrams (q-gram lemma)
+            if shared_count < max(len(self.name_grams[name_index]), len(text_grams)) - GRAM_SIZE * max_distance:
+                continue
+            distance: int = bounded_indel_distance(name, text, max_distance)
+            if distance > max_distance:
+                continue
+            score: float = 1 - distance / total
+            if score > best_score or (score == best_score and best_name is None):
+                best_name, best_score = name, score
+        return (best_name, best_score) if best_name is not None else (None, 0.0)
+
+
+def grams(text: str) -> set[str]:
+    """Returns the padded character trigrams of the text"""
+    padded: str = f"${text}$"
+    return {padded[index:index + GRAM_SIZE] for index in range(max(len(padded) - GRAM_SIZE + 1, 1))}
+
+
+def bounded_indel_distance(first: str, second: str, bound: int) -> int:
+    """Inserts and deletes needed to turn one string into the other, len(first) + len(second) - 2 * LCS
+    Returns bound + 1 as soon as the distance must exceed bound"""
+    if abs(len(first) - len(second)) > bound:
+        return bound + 1
+    previous: list[int] = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, start=1):
+        current: list[int] = [row] + [0] * len(second)
+        for column, second_char in enumerate(second, start=1):
+            current[column] = min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] if first_char == second_char else bound + 2,
+            )
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return previous[-1]
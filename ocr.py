@@ -2,17 +2,184 @@
 Contains all code related to turning a screenshot into a string
 """
 
-from typing import Any
+from typing import Any, Iterator
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+import atexit
+import hashlib
+import queue
+import threading
 import cv2
 import numpy as np
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
 from tesserocr import PyTessBaseAPI
+import frame
+import ocr_service
 import settings
+import telemetry
 
 TESSDATA_PATH = settings.TESSERACT_TESSDATA_PATH
 
 ALPHABET_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
 ROUND_WHITELIST = "0123456789-"
+AUGMENT_WHITELIST = ALPHABET_WHITELIST + " '+"
+
+
+class TesseractPool:
+    """Fixed size pool of long-lived Tesseract handles, one set of handles per (whitelist, psm) profile"""
+
+    def __init__(self, size: int, path: str = TESSDATA_PATH) -> None:
+        self.size: int = size
+        self.path: str = path
+        self.lock = threading.Lock()
+        self.profiles: dict[tuple[str, int], queue.Queue] = {}
+        self.created: dict[tuple[str, int], int] = {}
+        self.handles: list[PyTessBaseAPI] = []
+
+    def create_handle(self, whitelist: str, psm: int) -> PyTessBaseAPI:
+        """Initializes a Tesseract handle configured for a single profile"""
+        api = PyTessBaseAPI(path=self.path)
+        api.SetVariable("tessedit_char_whitelist", whitelist)
+        api.SetPageSegMode(psm)
+        self.handles.append(api)
+        return api
+
+    def warm_up(self, profiles: list[tuple[str, int]]) -> None:
+        """Pre-initializes every handle for the profiles passed in so the first read doesn't pay the model load"""
+        for whitelist, psm in profiles:
+            handles: list = [self.acquire(whitelist, psm) for _ in range(self.size)]
+            for api in handles:
+                self.release(whitelist, psm, api)
+
+    def acquire(self, whitelist: str, psm: int) -> PyTessBaseAPI:
+        """Takes a handle for the profile, creating one if the profile has not reached the pool size"""
+        profile: tuple[str, int] = (whitelist, psm)
+        with self.lock:
+            handles: queue.Queue = self.profiles.setdefault(profile, queue.Queue())
+            if handles.empty() and self.created.get(profile, 0) < self.size:
+                self.created[profile] = self.created.get(profile, 0) + 1
+                return self.create_handle(whitelist, psm)
+        return handles.get()
+
+    def release(self, whitelist: str, psm: int, api: PyTessBaseAPI) -> None:
+        """Returns a handle to the profile it was configured for"""
+        self.profiles[(whitelist, psm)].put(api)
+
+    @contextmanager
+    def lease(self, whitelist: str, psm: int) -> Iterator[PyTessBaseAPI]:
+        """Leases a configured handle for the duration of the with block"""
+        api: PyTessBaseAPI = self.acquire(whitelist, psm)
+        try:
+            yield api
+        finally:
+            self.release(whitelist, psm, api)
+
+    def close(self) -> None:
+        """Frees every handle the pool created"""
+        with self.lock:
+            for api in self.handles:
+                api.End()
+            self.handles.clear()
+            self.profiles.clear()
+            self.created.clear()
+
+
+ENGINE_POOL = TesseractPool(settings.OCR_POOL_SIZE)
+atexit.register(ENGINE_POOL.close)
+atexit.register(ocr_service.shutdown)
+
+
+class Preprocessor:  # pylint: disable=too-few-public-methods
+    """Fused grayscale, upscale and threshold for one region size, output buffers are reused across calls
+    With cache_threshold the Otsu threshold is kept while the region's mean brightness stays within
+    settings.OCR_THRESHOLD_DRIFT, a fixed screen region has a stable background between reads"""
+
+    def __init__(self, shape: tuple[int, int], scale: int, cache_threshold: bool) -> None:
+        self.cache_threshold: bool = cache_threshold
+        self.lock = threading.Lock()
+        self.gray: np.ndarray = np.empty(shape, dtype=np.uint8)
+        self.resized: np.ndarray = np.empty((shape[0] * scale, shape[1] * scale), dtype=np.uint8)
+        self.binary: np.ndarray = np.empty_like(self.resized)
+        self.threshold: float | None = None
+        self.background: float = 0.0
+
+    def run(self, region: np.ndarray) -> np.ndarray:
+        """Thresholds an RGB region into the shared output buffer, hold the lock until the result is consumed"""
+        cv2.cvtColor(region, cv2.COLOR_RGB2GRAY, dst=self.gray)
+        background: float = cv2.mean(self.gray)[0]
+        if (not self.cache_threshold or self.threshold is None
+                or abs(background - self.background) > settings.OCR_THRESHOLD_DRIFT):
+            # Otsu on the unscaled region, upscaling barely moves the histogram and costs scale^2 more pixels
+            self.threshold = cv2.threshold(self.gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[0]
+            self.background = background
+        else:
+            telemetry.count("ocr_threshold_reuses")
+        cv2.resize(self.gray, (self.resized.shape[1], self.resized.shape[0]), dst=self.resized,
+                   interpolation=cv2.INTER_LINEAR)
+        cv2.threshold(self.resized, self.threshold, 255, cv2.THRESH_BINARY_INV, dst=self.binary)
+        return self.binary
+
+
+_preprocessors: dict[tuple, Preprocessor] = {}
+_preprocessors_lock = threading.Lock()
+
+
+def preprocessor(region: np.ndarray, scale: int, screenxy: tuple | None = None) -> Preprocessor:
+    """Returns the preprocessor for a screen region, or for the image size when the image has no fixed region"""
+    key: tuple = (screenxy, region.shape[:2], scale)
+    with _preprocessors_lock:
+        if key not in _preprocessors:
+            _preprocessors[key] = Preprocessor(region.shape[:2], scale, cache_threshold=screenxy is not None)
+        return _preprocessors[key]
+
+
+class ResultCache:
+    """Bounded LRU of recognized text keyed by region, OCR profile and a hash of the thresholded pixels
+    Identical binarized pixels always read the same, so a hit skips Tesseract entirely"""
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[tuple, str] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def key(region: tuple | None, thresholding: np.ndarray, whitelist: str, psm: int) -> tuple:
+        """Builds the cache key, the hash covers the binarized pixels and their shape"""
+        digest: bytes = hashlib.blake2b(thresholding.tobytes(), digest_size=16).digest()
+        return (region, thresholding.shape, whitelist, psm, digest)
+
+    def get(self, key: tuple) -> str | None:
+        """Returns the cached text and marks it as recently used, None on a miss"""
+        with self.lock:
+            text: str | None = self.entries.get(key)
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+        telemetry.count("ocr_cache_misses" if text is None else "ocr_cache_hits")
+        return text
+
+    def put(self, key: tuple, text: str) -> None:
+        """Stores text, evicting the least recently used entries past the size limit"""
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops every entry and resets the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+RESULT_CACHE = ResultCache(settings.OCR_CACHE_SIZE)
 
 
 def image_grayscale(image: ImageGrab.Image) -> Any:
@@ -38,30 +205,71 @@ def image_resize(image: int, scale: int) -> Any:
     return image.resize((width, height))
 
 
-def get_text(screenxy: tuple, scale: int, psm: int, whitelist: str = "") -> str:
-    """Returns text from screen coordinates"""
-    screenshot = ImageGrab.grab(bbox=screenxy)
-    resize = image_resize(screenshot, scale)
-    array = image_array(resize)
-    grayscale = image_grayscale(array)
-    thresholding = image_thresholding(grayscale)
-    with PyTessBaseAPI(path=TESSDATA_PATH) as api:
-        api.SetVariable("tessedit_char_whitelist", whitelist)
-        api.SetPageSegMode(psm)
-        api.SetImageBytes(thresholding.tobytes(),thresholding.shape[1], thresholding.shape[0],1,thresholding.shape[1])
+def recognize(thresholding: np.ndarray, whitelist: str, psm: int) -> str:
+    """Runs a thresholded single channel image through a pooled Tesseract handle"""
+    telemetry.count("ocr_calls")
+    with ENGINE_POOL.lease(whitelist, psm) as api:
+        api.SetImageBytes(thresholding.tobytes(), thresholding.shape[1], thresholding.shape[0], 1,
+                          thresholding.shape[1])
         text = api.GetUTF8Text()
     return text.strip()
 
 
-def get_text_from_image(image: ImageGrab.Image, whitelist: str = "") -> str:
-    """Takes an image and returns the text"""
-    resize = image_resize(image, 3)
+def prepare_image(image: ImageGrab.Image, scale: int) -> np.ndarray:
+    """Upscales, grayscales and thresholds an image for Tesseract through PIL, the reference for Preprocessor"""
+    resize = image_resize(image, scale)
     array = image_array(resize)
     grayscale = image_grayscale(array)
-    thresholding = image_thresholding(grayscale)
-    with PyTessBaseAPI(path=TESSDATA_PATH) as api:
-        api.SetVariable("tessedit_char_whitelist", whitelist)
-        api.SetPageSegMode(7)
-        api.SetImageBytes(thresholding.tobytes(),thresholding.shape[1], thresholding.shape[0],1,thresholding.shape[1])
-        text = api.GetUTF8Text()
-    return text.strip()
+    return image_thresholding(grayscale)
+
+
+def submit(thresholding: np.ndarray, whitelist: str, psm: int) -> Future:
+    """Queues a thresholded image on the OCR worker processes, runs it inline if the service is disabled"""
+    service: ocr_service.OcrService | None = ocr_service.get_service()
+    if service is None:
+        future: Future = Future()
+        future.set_result(recognize(thresholding, whitelist, psm))
+        return future
+    telemetry.count("ocr_calls")
+    return service.submit(thresholding, whitelist, psm)
+
+
+def read(region: np.ndarray, scale: int, psm: int, whitelist: str, screenxy: tuple | None = None) -> Future:
+    """Preprocesses a region and returns a future for its text, answered from RESULT_CACHE when the pixels were
+    read before, otherwise by the OCR service with the result stored once it arrives"""
+    stage: Preprocessor = preprocessor(region, scale, screenxy)
+    with stage.lock:
+        thresholding: np.ndarray = stage.run(region)
+        key: tuple = RESULT_CACHE.key(screenxy, thresholding, whitelist, psm)
+        text: str | None = RESULT_CACHE.get(key)
+        if text is not None:
+            future: Future = Future()
+            future.set_result(text)
+            return future
+        future = submit(thresholding, whitelist, psm)
+    future.add_done_callback(
+        lambda done: RESULT_CACHE.put(key, done.result()) if done.exception() is None else None
+    )
+    return future
+
+
+@telemetry.traced("ocr.get_text")
+def get_text(screenxy: tuple, scale: int, psm: int, whitelist: str = "") -> str:
+    """Returns text from screen coordinates"""
+    return read(frame.current().region(screenxy), scale, psm, whitelist, screenxy).result()
+
+
+@telemetry.traced("ocr.get_text_from_image")
+def get_text_from_image(image: Image.Image | np.ndarray, whitelist: str = "") -> str:
+    """Takes an image and returns the text"""
+    return read(np.asarray(image)[..., :3], 3, 7, whitelist).result()
+
+
+def submit_text(screenxy: tuple, scale: int, psm: int, whitelist: str = "") -> Future:
+    """Returns a future for the text at the screen coordinates, the screen is captured before returning"""
+    return read(frame.current().region(screenxy), scale, psm, whitelist, screenxy)
+
+
+def submit_text_from_image(image: Image.Image | np.ndarray, whitelist: str = "") -> Future:
+    """Returns a future for the text in the image"""
+    return read(np.asarray(image)[..., :3], 3, 7, whitelist)
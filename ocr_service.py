@@ -0,0 +1,81 @@
+"""
+Runs Tesseract in a pool of worker processes so OCR doesn't block input or other reads
+Thresholded images are passed through shared memory instead of being pickled, results come back as futures
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import numpy as np
+from tesserocr import PyTessBaseAPI
+import settings
+
+_worker_handles: dict[tuple[str, int], PyTessBaseAPI] = {}
+_worker_tessdata: list[str] = []
+
+
+def start_worker(tessdata_path: str) -> None:
+    """Worker process initializer, handles are created per profile on first use and kept for the worker's life"""
+    _worker_tessdata.append(tessdata_path)
+
+
+def recognize_shared(memory_name: str, shape: tuple[int, int], whitelist: str, psm: int) -> str:
+    """Reads a thresholded image out of shared memory and returns its text, runs inside a worker"""
+    api: PyTessBaseAPI | None = _worker_handles.get((whitelist, psm))
+    if api is None:
+        api = PyTessBaseAPI(path=_worker_tessdata[0])
+        api.SetVariable("tessedit_char_whitelist", whitelist)
+        api.SetPageSegMode(psm)
+        _worker_handles[(whitelist, psm)] = api
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        image = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+        api.SetImageBytes(image.tobytes(), shape[1], shape[0], 1, shape[1])
+        del image
+    finally:
+        memory.close()
+    return api.GetUTF8Text().strip()
+
+
+class OcrService:
+    """Process pool where every worker holds its own Tesseract handles"""
+
+    def __init__(self, workers: int, tessdata_path: str = settings.TESSERACT_TESSDATA_PATH) -> None:
+        self.workers: int = workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=start_worker, initargs=(tessdata_path,)
+        )
+
+    def submit(self, thresholding: np.ndarray, whitelist: str, psm: int) -> Future:
+        """Copies the thresholded image into shared memory and queues it, the future resolves to the text"""
+        memory = shared_memory.SharedMemory(create=True, size=max(thresholding.nbytes, 1))
+        np.ndarray(thresholding.shape, dtype=np.uint8, buffer=memory.buf)[:] = thresholding
+        future: Future = self.executor.submit(recognize_shared, memory.name, thresholding.shape, whitelist, psm)
+
+        def release(_: Future) -> None:
+            memory.close()
+            memory.unlink()
+        future.add_done_callback(release)
+        return future
+
+    def close(self) -> None:
+        """Stops the worker processes"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+_service: list[OcrService] = []
+
+
+def get_service() -> OcrService | None:
+    """Returns the shared service, started on first use, or None when settings.OCR_WORKERS is 0"""
+    if settings.OCR_WORKERS == 0:
+        return None
+    if not _service:
+        _service.append(OcrService(settings.OCR_WORKERS or os.cpu_count() or 1))
+    return _service[0]
+
+
+def shutdown() -> None:
+    """Stops the shared service if it was started"""
+    while _service:
+        _service.pop().close()
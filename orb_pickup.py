@@ -0,0 +1,123 @@
+"""
+Picks up loot orbs by finding them on the board instead of walking a fixed set of waypoints
+Orbs are found by color and roundness in one downscaled frame, the tactician walks a short route through
+them and the board is scanned again until no orbs are left, so pickup takes as long as the orbs present
+The gray range also covers white UI, labels and bars on the board are told apart from orbs by their roundness
+The tactician's position is dead reckoned from where it was last sent, its sprite depends on the cosmetic
+"""
+
+import math
+from typing import Callable
+import cv2
+import numpy as np
+import frame
+import mk_functions
+import screen_context
+import screen_coords
+import settings
+import wait
+
+DOWNSCALE: int = 2
+# HSV ranges of the blue, gold and gray loot orbs, OpenCV hue runs 0-180
+ORB_COLORS: list[tuple[tuple[int, int, int], tuple[int, int, int]]] = [
+    ((95, 120, 150), (130, 255, 255)),
+    ((15, 120, 170), (35, 255, 255)),
+    ((0, 0, 200), (180, 40, 255)),
+]
+ORB_AREA: tuple[int, int] = (150, 400)  # Downscaled pixel area of an orb on a 1920x1080 screen
+MIN_FILL: float = 0.55  # Share of its bounding box a round orb covers
+MIN_CIRCULARITY: float = 0.8  # 4 pi area / perimeter^2 of the orb's outline, a square is 0.785
+ORB_RADIUS: int = 24  # Screen pixel radius of an orb on a 1920x1080 screen
+
+
+def orb_mask(image: np.ndarray) -> np.ndarray:
+    """Mask of the downscaled RGB image's pixels that have a loot orb color"""
+    small: np.ndarray = cv2.resize(np.ascontiguousarray(image[..., :3]), None, fx=1 / DOWNSCALE, fy=1 / DOWNSCALE,
+                                   interpolation=cv2.INTER_AREA)
+    hsv: np.ndarray = cv2.cvtColor(small, cv2.COLOR_RGB2HSV)
+    mask: np.ndarray = np.zeros(hsv.shape[:2], dtype=np.uint8)
+    for lower, upper in ORB_COLORS:
+        mask |= cv2.inRange(hsv, lower, upper)
+    return cv2.morphologyEx(mask, cv2.MORPH_OPEN, np.ones((3, 3), dtype=np.uint8))
+
+
+def circularity(component: np.ndarray) -> float:
+    """4 pi area / perimeter^2 of the outer outline of a binary component, 1 for a perfect circle"""
+    contours: tuple = cv2.findContours(component, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)[0]
+    outline: np.ndarray = max(contours, key=cv2.contourArea)
+    perimeter: float = cv2.arcLength(outline, True)
+    return 4 * math.pi * cv2.contourArea(outline) / perimeter ** 2 if perimeter > 0 else 0.0
+
+
+def is_round(component: np.ndarray) -> bool:
+    """Checks if a binary component cropped to its bounding box fills it and is outlined like an orb"""
+    return (np.count_nonzero(component) / component.size >= MIN_FILL
+            and circularity(np.pad(component, 1)) >= MIN_CIRCULARITY)
+
+
+def detect_orbs(image: np.ndarray, scale: float = 1.0) -> list[tuple[float, float]]:
+    """Returns the centers of loot orbs in an RGB image, in the image's pixels
+    scale is the screen's size relative to 1920x1080, orb areas are scaled by it"""
+    count, labels, stats, centroids = cv2.connectedComponentsWithStats(orb_mask(image), connectivity=8)
+    min_area, max_area = ORB_AREA[0] * scale ** 2, ORB_AREA[1] * scale ** 2
+    orbs: list[tuple[float, float]] = []
+    for index in range(1, count):
+        x_pos, y_pos, width, height, area = stats[index]
+        if not min_area <= area <= max_area or not 0.7 <= width / height <= 1.4:
+            continue
+        if is_round((labels[y_pos:y_pos + height, x_pos:x_pos + width] == index).astype(np.uint8)):
+            orbs.append((centroids[index][0] * DOWNSCALE, centroids[index][1] * DOWNSCALE))
+    return orbs
+
+
+def orb_collected(orb: tuple, scale: float = 1.0) -> Callable[[], bool]:
+    """Predicate that becomes true once no orb colored pixels are left in the box around the orb"""
+    box: tuple = wait.around(orb, round(ORB_RADIUS * scale))
+    return lambda: not np.any(orb_mask(frame.peek(box)))
+
+
+def route_length(start: tuple, route: list[tuple]) -> float:
+    """Length of the walk from start through the route in order"""
+    points: list[tuple] = [start] + route
+    return sum(math.dist(points[index], points[index + 1]) for index in range(len(route)))
+
+
+def plan_route(start: tuple, orbs: list[tuple]) -> list[tuple]:
+    """Orders the orbs into a short walk from start, nearest neighbour improved with 2-opt"""
+    remaining: list[tuple] = list(orbs)
+    route: list[tuple] = []
+    position: tuple = start
+    while remaining:
+        position = min(remaining, key=lambda orb: math.dist(position, orb))
+        remaining.remove(position)
+        route.append(position)
+    improved: bool = True
+    while improved:
+        improved = False
+        for first in range(len(route) - 1):
+            for last in range(first + 1, len(route)):
+                candidate: list[tuple] = route[:first] + route[first:last + 1][::-1] + route[last + 1:]
+                if route_length(start, candidate) < route_length(start, route) - 1e-6:
+                    route = candidate
+                    improved = True
+    return route
+
+
+def pickup_items() -> None:
+    """Walks over every loot orb on the board, rescanning after each route until none are left"""
+    area: tuple = screen_coords.ITEM_PICKUP_POS.get_coords()
+    scale: float = screen_context.current().x_scale
+    position: tuple = mk_functions.last_move() or screen_coords.TACTICIAN_HOME_LOC.get_coords()
+    for _ in range(settings.ORB_PICKUP_SCANS):
+        orbs: list[tuple] = [
+            (round(x_pos + area[0]), round(y_pos + area[1]))
+            for x_pos, y_pos in detect_orbs(frame.current().region(area), scale)
+        ]
+        if not orbs:
+            return
+        print(f"  Picking up {len(orbs)} orbs")
+        for orb in plan_route(position, orbs):
+            mk_functions.right_click(orb)
+            walk: float = math.dist(position, orb) / (settings.TACTICIAN_SPEED * scale)
+            wait.until(orb_collected(orb, scale), timeout=walk + 0.5)
+            position = orb
@@ -0,0 +1,146 @@
+"""
+Supervises several bot instances on one host, each in its own worker process
+Every worker is bound to its own game window rectangle and League client or to a replay recording, crashed
+workers are restarted and the telemetry of every finished game is merged into one summary
+Workers file:
+  [{"name": "bot-1", "window": [0, 0, 1280, 720], "client_path": "C:\\\\Riot Games\\\\League of Legends"},
+   {"name": "replay-1", "recording": "recordings/game-1"}]
+Usage: python orchestrator.py <workers.json>
+"""
+
+import argparse
+from dataclasses import dataclass
+import json
+import multiprocessing
+import queue
+import time
+import settings
+import telemetry
+from vec4 import GameWindow
+
+
+@dataclass
+class WorkerSpec:
+    """What a single bot instance plays on"""
+
+    name: str
+    window: GameWindow | None = None
+    client_path: str | None = None
+    recording: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WorkerSpec":
+        """Reads one entry of the workers file"""
+        return cls(data["name"], GameWindow(*data["window"]) if data.get("window") else None,
+                   data.get("client_path"), data.get("recording"))
+
+
+class DiscardQueue:  # pylint: disable=too-few-public-methods
+    """Stands in for the overlay's message queue, workers run without an overlay"""
+
+    def put(self, message) -> None:
+        """Drops the message"""
+
+
+def run_worker(spec: WorkerSpec, reports: multiprocessing.Queue) -> None:
+    """Worker process entry, plays games forever or replays the recording once, reporting each game's telemetry"""
+    # Imported here so the control process never loads the bot's screen and OCR state
+    import auto_queue  # pylint: disable=import-outside-toplevel
+    from game import Game  # pylint: disable=import-outside-toplevel
+    import replay  # pylint: disable=import-outside-toplevel
+
+    if spec.recording is not None:
+        replay.replay(spec.recording)
+        reports.put((spec.name, telemetry.export()))
+        return
+    while True:
+        auto_queue.queue(spec.client_path)
+        Game(DiscardQueue(), spec.window)
+        reports.put((spec.name, telemetry.export()))
+
+
+@dataclass
+class Worker:
+    """A supervised worker process and its restart history"""
+
+    spec: WorkerSpec
+    process: multiprocessing.Process | None = None
+    restarts: int = 0
+    restart_at: float = 0.0
+    finished: bool = False
+
+
+class Orchestrator:
+    """Starts the workers, restarts the ones that crash and aggregates their telemetry"""
+
+    def __init__(self, specs: list[WorkerSpec]) -> None:
+        self.workers: list[Worker] = [Worker(spec) for spec in specs]
+        self.reports: multiprocessing.Queue = multiprocessing.Queue()
+        self.games: int = 0
+
+    def start(self, worker: Worker) -> None:
+        """Starts a worker's process"""
+        # Not a daemon, workers start their own OCR worker processes
+        worker.process = multiprocessing.Process(target=run_worker, args=(worker.spec, self.reports),
+                                                 name=worker.spec.name)
+        worker.process.start()
+        print(f"  [{worker.spec.name}] Started (pid {worker.process.pid})")
+
+    def supervise(self, worker: Worker) -> None:
+        """Restarts a crashed worker after settings.WORKER_RESTART_DELAY, a worker that exited cleanly is done"""
+        if worker.finished or worker.process is None or worker.process.is_alive():
+            return
+        if worker.process.exitcode == 0:
+            worker.finished = True
+            print(f"  [{worker.spec.name}] Finished")
+            return
+        if worker.restart_at == 0.0:
+            worker.restart_at = time.monotonic() + settings.WORKER_RESTART_DELAY
+            print(f"  [{worker.spec.name}] Exited with code {worker.process.exitcode}, "
+                  f"restarting in {settings.WORKER_RESTART_DELAY}s")
+        elif time.monotonic() >= worker.restart_at:
+            worker.restarts += 1
+            worker.restart_at = 0.0
+            self.start(worker)
+
+    def collect(self, timeout: float) -> None:
+        """Merges the telemetry reports the workers sent"""
+        try:
+            name, exported = self.reports.get(timeout=timeout)
+            while True:
+                telemetry.merge(exported)
+                self.games += 1
+                print(f"  [{name}] Game finished, {self.games} games played")
+                name, exported = self.reports.get_nowait()
+        except queue.Empty:
+            pass
+
+    def run(self) -> None:
+        """Supervises until every worker finished or the orchestrator is interrupted"""
+        for worker in self.workers:
+            self.start(worker)
+        try:
+            while not all(worker.finished for worker in self.workers):
+                self.collect(timeout=1)
+                for worker in self.workers:
+                    self.supervise(worker)
+        except KeyboardInterrupt:
+            print("\n[Orchestrator] Stopping workers")
+        finally:
+            for worker in self.workers:
+                if worker.process is not None and worker.process.is_alive():
+                    worker.process.terminate()
+            self.collect(timeout=0)
+            print(f"\n[Orchestrator] {self.games} games, "
+                  f"{sum(worker.restarts for worker in self.workers)} restarts")
+            print(telemetry.summary())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("workers", help="JSON file describing the bot instances")
+    arguments = parser.parse_args()
+    with open(arguments.workers, "r", encoding="utf-8") as workers_file:
+        worker_specs: list[WorkerSpec] = [WorkerSpec.from_dict(entry) for entry in json.load(workers_file)]
+    print(f"[Orchestrator] Supervising {len(worker_specs)} workers")
+    Orchestrator(worker_specs).run()
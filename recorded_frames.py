@@ -0,0 +1,49 @@
+"""
+Reads recorded game window frames back by capture time, from a directory of images or a video
+"""
+
+import bisect
+from pathlib import Path
+import cv2
+import numpy as np
+
+
+class DirectoryFrames:  # pylint: disable=too-few-public-methods
+    """Recorded frames stored as <milliseconds>.png files"""
+
+    def __init__(self, directory: Path) -> None:
+        self.paths: list[Path] = sorted(directory.glob("*.png"), key=lambda path: int(path.stem))
+        if not self.paths:
+            raise ValueError(f"No frames found in {directory}")
+        self.times: list[float] = [int(path.stem) / 1000 for path in self.paths]
+        self.loaded: tuple[int, np.ndarray] | None = None
+        self.end: float = self.times[-1]
+
+    def frame_at(self, time: float) -> np.ndarray:
+        """Returns the last frame captured at or before the time passed in"""
+        index: int = max(bisect.bisect_right(self.times, time) - 1, 0)
+        if self.loaded is None or self.loaded[0] != index:
+            self.loaded = (index, cv2.cvtColor(cv2.imread(str(self.paths[index])), cv2.COLOR_BGR2RGB))
+        return self.loaded[1]
+
+
+class VideoFrames:  # pylint: disable=too-few-public-methods
+    """Recorded frames stored as a video, decoded forward as the replay clock advances"""
+
+    def __init__(self, path: Path, fps: float) -> None:
+        self.capture = cv2.VideoCapture(str(path))
+        self.fps: float = fps
+        self.end: float = self.capture.get(cv2.CAP_PROP_FRAME_COUNT) / fps
+        self.index: int = -1
+        self.current: np.ndarray | None = None
+
+    def frame_at(self, time: float) -> np.ndarray:
+        """Returns the last frame captured at or before the time passed in"""
+        target: int = max(int(time * self.fps), 0)
+        while self.index < target or self.current is None:
+            success, image = self.capture.read()
+            if not success:
+                break
+            self.index += 1
+            self.current = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return self.current
@@ -0,0 +1,144 @@
+"""
+Runs a whole game headless from a recording instead of a live League client
+Screenshots come from recorded frames, Live Client API responses from a JSON timeline, input is recorded
+instead of sent and every sleep is skipped so a game replays faster than real time
+Recording layout:
+  <recording>/timeline.json  {"window": [x, y, width, height], "fps": 10,
+                              "api": [{"time": 1.5, "endpoint": "activeplayer", "response": {...}}, ...]}
+  <recording>/frames/<milliseconds>.png  full window frames named by capture time, or
+  <recording>/frames.mp4  a video of the window, frame times come from "fps"
+Usage: python replay.py <recording> [--events events.json]
+"""
+
+import argparse
+import bisect
+import json
+import queue
+from pathlib import Path
+import numpy as np
+import requests
+import clock
+import frame
+import live_client
+import mk_functions
+import telemetry
+from game import Game
+from recorded_frames import DirectoryFrames, VideoFrames
+from vec4 import GameWindow
+
+
+class ReplayFinished(Exception):
+    """Raised when the bot asks for a frame after the end of the recording"""
+
+
+class ScreenReplay:  # pylint: disable=too-few-public-methods
+    """Screen source for frame.set_screen_source that crops recorded frames at the replay clock's time"""
+
+    def __init__(self, frames: DirectoryFrames | VideoFrames, window: GameWindow) -> None:
+        self.frames = frames
+        self.window: GameWindow = window
+
+    def __call__(self, coords: tuple) -> np.ndarray:
+        time: float = clock.perf_counter()
+        if time > self.frames.end:
+            raise ReplayFinished(f"Recording ended at {self.frames.end:.1f}s")
+        return frame.crop(self.frames.frame_at(time), (coords[0] - self.window.x_pos, coords[1] - self.window.y_pos,
+                                                      coords[2] - self.window.x_pos, coords[3] - self.window.y_pos))
+
+
+class ApiReplay:
+    """Stands in for live_client.CLIENT and answers with the recorded response for the replay clock's time"""
+
+    def __init__(self, timeline: list[dict]) -> None:
+        self.responses: dict[str, tuple[list[float], list[dict]]] = {}
+        for entry in sorted(timeline, key=lambda entry: entry["time"]):
+            times, responses = self.responses.setdefault(entry["endpoint"], ([], []))
+            times.append(entry["time"])
+            responses.append(entry["response"])
+        self.end: float = max((times[-1] for times, _ in self.responses.values()), default=0.0)
+
+    def fetch(self, endpoint: str) -> dict:
+        """Returns the latest recorded response, the API is unreachable outside of the recording"""
+        time: float = clock.perf_counter()
+        times, responses = self.responses.get(endpoint, ([], []))
+        index: int = bisect.bisect_right(times, time) - 1
+        if index < 0 or time > self.end:
+            raise requests.exceptions.ConnectionError(f"No recorded {endpoint} response at {time:.1f}s")
+        return responses[index]
+
+    def all_game_data(self) -> dict:
+        """Returns the recorded full game data"""
+        return self.fetch("allgamedata")
+
+    def active_player(self) -> dict:
+        """Returns the recorded active player, derived from allgamedata if only that was recorded"""
+        if "activeplayer" in self.responses:
+            return self.fetch("activeplayer")
+        return self.fetch("allgamedata")["activePlayer"]
+
+    def invalidate(self) -> None:
+        """Recorded responses are never cached"""
+
+
+class InputRecorder:
+    """Input sink for mk_functions.set_input_sink that records every action instead of sending it"""
+
+    # pylint: disable=invalid-name
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+
+    def record(self, action: str, **details) -> None:
+        """Stores an action with the replay clock's time"""
+        self.events.append({"time": round(clock.perf_counter(), 3), "action": action, **details})
+
+    def moveTo(self, x_pos: int, y_pos: int) -> None:
+        """Records a mouse move"""
+        self.record("move", x=x_pos, y=y_pos)
+
+    def mouseDown(self, button: str = "left") -> None:
+        """Records a mouse button press"""
+        self.record("mouse_down", button=button)
+
+    def mouseUp(self, button: str = "left") -> None:
+        """Records a mouse button release"""
+        self.record("mouse_up", button=button)
+
+    def press(self, key: str) -> None:
+        """Records a key press"""
+        self.record("press", key=key)
+
+
+def replay(recording: str) -> InputRecorder:
+    """Plays the bot through a recording and returns the input it would have sent"""
+    directory = Path(recording)
+    with open(directory / "timeline.json", "r", encoding="utf-8") as data:
+        timeline: dict = json.load(data)
+    window = GameWindow(*timeline["window"])
+    if (directory / "frames.mp4").is_file():
+        frames = VideoFrames(directory / "frames.mp4", timeline["fps"])
+    else:
+        frames = DirectoryFrames(directory / "frames")
+
+    recorder = InputRecorder()
+    clock.set_clock(clock.VirtualClock())
+    frame.set_screen_source(ScreenReplay(frames, window))
+    mk_functions.set_input_sink(recorder)
+    live_client.CLIENT = ApiReplay(timeline.get("api", []))
+    try:
+        Game(queue.Queue(), window)
+    except ReplayFinished as finished:
+        print(f"\n[Replay] {finished}")
+        print(telemetry.summary())
+    return recorder
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", help="Directory containing timeline.json and frames")
+    parser.add_argument("--events", help="Path to write the recorded input events as JSON")
+    arguments = parser.parse_args()
+    recorded: InputRecorder = replay(arguments.recording)
+    print(f"[Replay] {len(recorded.events)} input events at {clock.perf_counter():.1f}s of game time")
+    if arguments.events:
+        with open(arguments.events, "w", encoding="utf-8") as output:
+            json.dump(recorded.events, output, indent=1)
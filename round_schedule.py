@@ -0,0 +1,105 @@
+"""
+Per-game table of what happens in every round, indexed by (stage, round)
+Each cell holds RoundFlag bits built once from the round sets in game_assets, a schedule is never modified,
+patching a stage from the encounter reader returns a new schedule
+"""
+
+from enum import IntFlag
+import numpy as np
+import game_assets
+
+STAGES: int = 8
+ROUNDS_PER_STAGE: int = 10  # Rounds 1-8 plus room for flags set on the round after the last one
+
+
+class RoundFlag(IntFlag):
+    """What the bot does in a round"""
+
+    NONE = 0
+    PVP = 1
+    PVE = 2
+    CAROUSEL = 4
+    SECOND = 8
+    ENCOUNTER = 16
+    ANVIL = 32
+    AUGMENT = 64
+    PICKUP = 128
+    ITEM_PLACEMENT = 256
+
+
+# Flags that encounter_round_setup reads from the stage icons instead of trusting the defaults
+STAGE_ICON_FLAGS: RoundFlag = (
+    RoundFlag.CAROUSEL | RoundFlag.PVE | RoundFlag.PVP | RoundFlag.ANVIL | RoundFlag.ITEM_PLACEMENT
+)
+
+
+def parse_round(game_round: str) -> tuple[int, int]:
+    """Turns a "stage-round" label into integers, (0, 0) if it isn't one"""
+    stage, _, round_number = game_round.partition("-")
+    try:
+        return int(stage), int(round_number)
+    except ValueError:
+        return 0, 0
+
+
+class RoundSchedule:
+    """Read-only array of RoundFlag bits per (stage, round)"""
+
+    def __init__(self, flags: np.ndarray) -> None:
+        self.table: np.ndarray = flags
+        self.table.setflags(write=False)
+
+    @classmethod
+    def from_assets(cls) -> "RoundSchedule":
+        """Builds the default schedule from the round sets in game_assets"""
+        table: np.ndarray = np.zeros((STAGES, ROUNDS_PER_STAGE), dtype=np.uint16)
+        round_sets: dict[RoundFlag, set[str]] = {
+            RoundFlag.PVP: game_assets.PVP_ROUND,
+            RoundFlag.PVE: game_assets.PVE_ROUND,
+            RoundFlag.CAROUSEL: game_assets.CAROUSEL_ROUND,
+            RoundFlag.SECOND: game_assets.SECOND_ROUND,
+            RoundFlag.ENCOUNTER: game_assets.ENCOUNTER_ROUNDS,
+            RoundFlag.ANVIL: game_assets.ANVIL_ROUNDS,
+            RoundFlag.AUGMENT: game_assets.AUGMENT_ROUNDS,
+            RoundFlag.PICKUP: game_assets.PICKUP_ROUNDS,
+            RoundFlag.ITEM_PLACEMENT: game_assets.ITEM_PLACEMENT_ROUNDS,
+        }
+        for flag, rounds in round_sets.items():
+            for game_round in rounds:
+                stage, round_number = parse_round(game_round)
+                if 0 < stage < STAGES and 0 < round_number < ROUNDS_PER_STAGE:
+                    table[stage, round_number] |= flag
+        return cls(table)
+
+    def flags(self, stage: int, round_number: int) -> RoundFlag:
+        """Returns the flags of a round, NONE for rounds outside of the table"""
+        if 0 <= stage < STAGES and 0 <= round_number < ROUNDS_PER_STAGE:
+            return RoundFlag(int(self.table[stage, round_number]))
+        return RoundFlag.NONE
+
+    def with_stage(self, stage: int, round_types: list[str]) -> "RoundSchedule":
+        """Returns a schedule with the stage rebuilt from the stage icons, round_types[0] is the current round
+        Carousels are followed by an anvil and item placement, an encounter on the second round of stage 3 or 4
+        moves the augment to the round after it"""
+        if not 0 <= stage < STAGES:
+            return self
+        table: np.ndarray = self.table.copy()
+        table[stage] &= ~np.uint16(int(STAGE_ICON_FLAGS))
+        flags: dict[str, RoundFlag] = {
+            "carousel": RoundFlag.CAROUSEL, "pve": RoundFlag.PVE, "pvp": RoundFlag.PVP,
+            "encounter": RoundFlag.ENCOUNTER,
+        }
+        for round_number, round_type in enumerate(round_types[1:], start=2):
+            if round_number >= ROUNDS_PER_STAGE or round_type not in flags:
+                continue
+            table[stage, round_number] |= flags[round_type]
+            if round_number + 1 >= ROUNDS_PER_STAGE:
+                continue
+            if round_type == "carousel":
+                table[stage, round_number + 1] |= RoundFlag.ANVIL | RoundFlag.ITEM_PLACEMENT
+            elif round_type == "encounter" and round_number == 2 and 3 <= stage <= 4:
+                table[stage, round_number + 1] |= RoundFlag.AUGMENT
+        return RoundSchedule(table)
+
+
+DEFAULT_SCHEDULE: RoundSchedule = RoundSchedule.from_assets()
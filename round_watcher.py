@@ -0,0 +1,61 @@
+"""
+Watches the round label and only runs OCR when its pixels change
+The label is binarized so the background doesn't flicker it, a single changed digit flips dozens of pixels
+The label is still decoded every settings.ROUND_DECODE_INTERVAL seconds in case a change was missed
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+from clock import perf_counter
+import digit_reader
+import frame
+import screen_coords
+import settings
+
+
+@dataclass
+class RoundChange:
+    """Event published when the round label decodes to a different round"""
+
+    previous: list[str, int]
+    current: list[str, int]
+
+
+class RoundWatcher:
+    """Binarizes the round label every poll and decodes it with decode(preferred layout) only when it changes"""
+
+    def __init__(self, decode: Callable[[int], list[str, int]]) -> None:
+        self.decode: Callable[[int], list[str, int]] = decode
+        self.label: np.ndarray | None = None
+        self.decoded_at: float = -math.inf
+        self.round: list[str, int] = ["0-0", 0]
+        self.layout: int = 3
+
+    def label_changed(self, label: np.ndarray) -> bool:
+        """Checks if the binarized label differs from the last decoded one by more than the flicker tolerance"""
+        return (
+            self.label is None
+            or self.label.shape != label.shape
+            or np.count_nonzero(label != self.label) > settings.ROUND_LABEL_TOLERANCE
+        )
+
+    def poll(self) -> RoundChange | None:
+        """Returns a RoundChange if the round label shows a new round since the last poll"""
+        label: np.ndarray = digit_reader.binarize_digits(frame.peek(screen_coords.ROUND_POS.get_coords()))
+        if not self.label_changed(label) and perf_counter() - self.decoded_at < settings.ROUND_DECODE_INTERVAL:
+            return None
+        game_round: list[str, int] = self.decode(self.layout)
+        self.decoded_at = perf_counter()
+        if game_round[1] == 0:
+            # Label is mid animation or covered, leave it unset so the next poll tries again
+            self.label = None
+            return None
+        self.label = label
+        self.layout = game_round[1]
+        if game_round[0] == self.round[0]:
+            return None
+        change = RoundChange(self.round, game_round)
+        self.round = game_round
+        return change
@@ -0,0 +1,48 @@
+"""
+Offset and scale that turn 1920x1080 reference coordinates into screen coordinates for one game window
+The active context lives in a context variable so several window geometries can be used in one interpreter,
+Vec2 and Vec4 read it every time they are converted to screen coordinates
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Iterator
+
+
+@dataclass(frozen=True)
+class ScreenContext:
+    """Transformation from reference coordinates to a game window on screen"""
+
+    x_offset: float = 0
+    y_offset: float = 0
+    x_scale: float = 1
+    y_scale: float = 1
+
+    @classmethod
+    def for_window(cls, x_pos: int, y_pos: int, width: int, height: int) -> "ScreenContext":
+        """Context for a game window at (x_pos, y_pos) with the size passed in"""
+        return cls(x_pos, y_pos, width / 1920, height / 1080)
+
+
+_active: ContextVar[ScreenContext] = ContextVar("screen_context", default=ScreenContext())
+
+
+def current() -> ScreenContext:
+    """Returns the context used by the calling thread or task"""
+    return _active.get()
+
+
+def activate(context: ScreenContext) -> Token:
+    """Makes the context active for the calling thread or task until it is replaced or reset"""
+    return _active.set(context)
+
+
+@contextmanager
+def using(context: ScreenContext) -> Iterator[ScreenContext]:
+    """Makes the context active for the with block only"""
+    token: Token = _active.set(context)
+    try:
+        yield context
+    finally:
+        _active.reset(token)
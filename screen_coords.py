@@ -7,6 +7,8 @@ Screen coords for 1920x1080 screens
 from vec4 import Vec4, GameWindow
 from vec2 import Vec2
 
+GAME_WINDOW_POS: Vec4 = Vec4(GameWindow(0, 0, 1920, 1080))
+
 BENCH_HEALTH_POS: list[Vec4] = [
     Vec4(GameWindow(369, 650, 472, 757)),
     Vec4(GameWindow(485, 650, 588, 757)),
@@ -32,6 +34,20 @@ ITEM_POS: list[list] = [
     [Vec2(457, 628), Vec4(GameWindow(559, 670, 797, 701))],
 ]
 
+# Item icons centered on the ITEM_POS hover anchors
+ITEM_ICON_POS: list[Vec4] = [
+    Vec4(GameWindow(259, 739, 287, 767)),
+    Vec4(GameWindow(334, 723, 362, 751)),
+    Vec4(GameWindow(275, 678, 303, 706)),
+    Vec4(GameWindow(342, 662, 370, 690)),
+    Vec4(GameWindow(293, 617, 321, 645)),
+    Vec4(GameWindow(309, 572, 337, 600)),
+    Vec4(GameWindow(393, 665, 421, 693)),
+    Vec4(GameWindow(365, 618, 393, 646)),
+    Vec4(GameWindow(382, 568, 410, 596)),
+    Vec4(GameWindow(443, 614, 471, 642)),
+]
+
 ROUND_POS: Vec4 = Vec4(GameWindow(753, 10, 870, 34))
 
 ROUND_POS_ONE: Vec4 = Vec4(GameWindow(0, 0, 40, 24), use_screen_offset=False)
@@ -51,6 +67,18 @@ ROUND_ENCOUNTER_ICON_POS: list[list[Vec2, Vec4]] = [
     [Vec2(1085, 20), Vec4(GameWindow(1142, 49, 1470, 75))],
 ]
 
+# Stage icons centered on the ROUND_ENCOUNTER_ICON_POS hover anchors
+ROUND_ENCOUNTER_ICON_BOX: list[Vec4] = [
+    Vec4(GameWindow(821, 8, 845, 32)),
+    Vec4(GameWindow(857, 8, 881, 32)),
+    Vec4(GameWindow(893, 8, 917, 32)),
+    Vec4(GameWindow(929, 8, 953, 32)),
+    Vec4(GameWindow(965, 8, 989, 32)),
+    Vec4(GameWindow(1001, 8, 1025, 32)),
+    Vec4(GameWindow(1037, 8, 1061, 32)),
+    Vec4(GameWindow(1073, 8, 1097, 32)),
+]
+
 SHOP_POS: Vec4 = Vec4(GameWindow(481, 1039, 1476, 1070))
 
 CHAMP_NAME_POS: list[Vec4] = [
@@ -146,6 +174,15 @@ BOARD_LOC: list[Vec2] = [
 
 CAROUSEL_LOC: Vec2 = Vec2(964, 620)
 
+# Board area loot orbs drop in, covers every ITEM_PICKUP_LOC waypoint
+ITEM_PICKUP_POS: Vec4 = Vec4(GameWindow(360, 180, 1500, 660))
+
+# Where the tactician stands on its board before it is moved
+TACTICIAN_HOME_LOC: Vec2 = Vec2(420, 610)
+
+# Area around CAROUSEL_LOC the carousel units rotate through
+CAROUSEL_POS: Vec4 = Vec4(GameWindow(604, 320, 1324, 920))
+
 EXIT_NOW_LOC: Vec2 = Vec2(963, 575)
 
 BUY_XP_LOC: Vec2 = Vec2(364, 964)
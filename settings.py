@@ -4,3 +4,32 @@ FORFEIT = False
 FORFEIT_TIME = 600  # Time in seconds
 LEAGUE_CLIENT_PATH = r'C:\\Riot Games\\League of Legends' # Replace with your game path if needed.
 TESSERACT_TESSDATA_PATH = r'C:\\Program Files\\Tesseract-OCR\\tessdata'
+OCR_POOL_SIZE = 5  # Tesseract handles kept per OCR profile, matches the five shop reader threads
+OCR_WORKERS = None  # OCR worker processes, None uses one per core and 0 runs OCR in the bot process
+OCR_THRESHOLD_DRIFT = 2.0  # Mean gray level change of a screen region before its cached OCR threshold is recomputed
+OCR_CACHE_SIZE = 256  # Recognized strings kept by the OCR result cache before the least recently used is evicted
+FRAME_MAX_AGE = 0.1  # Seconds a shared screen capture is reused before readers grab the window again
+FRAME_RING_SHAPE = (1080, 1920)  # Largest (height, width) game window frame the shared frame ring holds
+FRAME_RING_SLOTS = 0  # Frames shared with other processes before the oldest is overwritten, 0 disables sharing
+CHAMPION_TEMPLATES_PATH = 'templates/champions.npz'  # Built with template_matcher.py from labelled shop name crops
+SHOP_TEMPLATE_CONFIDENCE = 0.85  # Shop slots matched below this correlation are read with Tesseract instead
+LIVE_CLIENT_TTL = 0.25  # Seconds a Live Client Data API response is reused for level, health, etc.
+ROUND_POLL_INTERVAL = 0.2  # Seconds between round label checks, OCR only runs when the label changes
+ROUND_LABEL_TOLERANCE = 12  # Binarized round label pixels that can flicker before the label counts as changed
+ROUND_DECODE_INTERVAL = 5  # Seconds between OCR reads of the round label while its pixels look unchanged
+REGION_HASH_TOLERANCE = 3  # Hash bits a watched region can flicker by before it counts as changed
+TRACE_PATH = None  # File per-round stage timings are appended to as JSON lines, e.g. 'traces.jsonl', None disables it
+WORKER_RESTART_DELAY = 10  # Seconds the orchestrator waits before restarting a crashed bot worker
+ITEM_TEMPLATES_PATH = 'templates/items.npz'  # Built with template_matcher.py --color from labelled item bench icons
+ITEM_TEMPLATE_CONFIDENCE = 0.9  # Item icons matched below this correlation are hovered and read from the tooltip
+DIGIT_TEMPLATES_PATH = 'templates/digits.npz'  # Built with digit_reader.py from gold and round crops named by text
+DIGIT_CONFIDENCE = 0.8  # Digit reads whose least certain glyph scores below this are read with Tesseract instead
+STAGE_ICON_TEMPLATES_PATH = 'templates/stage_icons.npz'  # Built with template_matcher.py --color from stage icon crops
+STAGE_ICON_CONFIDENCE = 0.9  # Stage icons matched below this correlation are hovered and read from the tooltip
+CAROUSEL_TEMPLATES_PATH = 'templates/carousel.npz'  # Built with template_matcher.py --color from carousel unit crops
+CAROUSEL_TEMPLATE_CONFIDENCE = 0.85  # Carousel units matched below this correlation are treated as unknown
+CAROUSEL_DOWNSCALE = 4  # Factor the carousel is shrunk by before looking for moving units
+CAROUSEL_CLICK_INTERVAL = 0.3  # Seconds between right clicks while walking to a carousel unit
+CAROUSEL_LEAD = 0.4  # Seconds ahead of a unit's predicted position the tactician is sent to
+TACTICIAN_SPEED = 600  # Pixels per second the tactician walks at on a 1920x1080 screen, sets orb pickup timeouts
+ORB_PICKUP_SCANS = 4  # Times the board is scanned for loot orbs left over before item pickup gives up
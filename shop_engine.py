@@ -0,0 +1,42 @@
+"""
+Decides which shop slots to buy from one gold read
+Champions are ranked with a value table precomputed from the comp, gold is tracked from champion costs
+"""
+
+import game_assets
+
+
+class ShopEngine:
+    """Value table for the comp's champions that turns a shop view into a purchase list"""
+
+    def __init__(self, comp: dict) -> None:
+        self.values: dict[str, float] = {}
+        for priority, (champ_name, champion_data) in enumerate(comp.items()):
+            self.values[champ_name] = (
+                4 * champion_data["final_comp"]
+                + 2 * champion_data["level"]
+                + (champion_data["board_position"] >= 21)  # Front row (BOARD_LOC 21-27) units are needed first
+                - priority / len(comp)  # Earlier comp entries break ties
+            )
+
+    def score(self, champ_name: str, wanted: int) -> float:
+        """Value of buying one more copy, copies still needed for the target level count the most"""
+        return self.values.get(champ_name, 0.0) + 8 * (wanted > 0)
+
+    def decide(self, shop: list, gold: int, champs_to_buy: dict) -> list[tuple[int, str]]:
+        """Returns the (shop slot, champion) pairs to buy in order, highest value first, within the gold passed in
+        A champion is wanted while its champs_to_buy count is not negative"""
+        wanted: dict = dict(champs_to_buy)
+        candidates: list = sorted(
+            (slot for slot in shop if slot[1] in game_assets.CHAMPIONS and wanted.get(slot[1], -1) >= 0),
+            key=lambda slot: (-self.score(slot[1], wanted[slot[1]]), slot[0]),
+        )
+        purchases: list[tuple[int, str]] = []
+        for slot in candidates:
+            cost: int = game_assets.champion_gold_cost(slot[1])
+            if wanted[slot[1]] < 0 or cost > gold:
+                continue
+            purchases.append(slot)
+            gold -= cost
+            wanted[slot[1]] -= 1
+        return purchases
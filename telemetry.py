@@ -0,0 +1,118 @@
+"""
+Per-stage latency tracing for round handlers, OCR and other hot paths
+Stages record wall time, time spent in sleep(), OCR calls, screen grabs and HTTP calls
+A summary is printed at game end and each round is written as one JSON line to settings.TRACE_PATH if it is set
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+import json
+import statistics
+import threading
+from typing import Callable, Iterator
+import clock
+import settings
+
+_lock = threading.Lock()
+_counters: Counter = Counter()
+_round_stages: list[dict] = []
+_durations: dict[str, list[tuple[float, float]]] = {}
+
+
+def count(counter: str, amount: int = 1) -> None:
+    """Increments a counter such as ocr_calls, screen_grabs or http_calls, safe to call from any thread"""
+    with _lock:
+        _counters[counter] += amount
+
+
+def snapshot() -> tuple[float, float, int, Counter]:
+    """Returns the current time, sleep totals and counters"""
+    slept, sleeps = clock.slept()
+    with _lock:
+        return clock.perf_counter(), slept, sleeps, _counters.copy()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Times the with block and records what it did, nested stages are recorded separately"""
+    start: tuple[float, float, int, Counter] = snapshot()
+    try:
+        yield
+    finally:
+        end: tuple[float, float, int, Counter] = snapshot()
+        wall: float = end[0] - start[0]
+        sleep: float = end[1] - start[1]
+        record: dict = {
+            "stage": name,
+            "wall_ms": round(wall * 1000, 2),
+            "sleep_ms": round(sleep * 1000, 2),
+            "compute_ms": round(max(wall - sleep, 0.0) * 1000, 2),
+            "sleeps": end[2] - start[2],
+            **(end[3] - start[3]),
+        }
+        with _lock:
+            _round_stages.append(record)
+            _durations.setdefault(name, []).append((wall, sleep))
+
+
+def traced(name: str | None = None) -> Callable:
+    """Decorator that runs the function inside a stage named after it"""
+    def decorator(function: Callable) -> Callable:
+        stage_name: str = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def flush_round(game_round: str) -> None:
+    """Writes the stages recorded since the last flush as one JSON line for the round"""
+    with _lock:
+        stages: list[dict] = _round_stages.copy()
+        _round_stages.clear()
+    if settings.TRACE_PATH is None or not stages:
+        return
+    with open(settings.TRACE_PATH, "a", encoding="utf-8") as trace:
+        trace.write(json.dumps({"round": game_round, "stages": stages}) + "\n")
+
+
+def summary() -> str:
+    """Returns a table of per-stage latency percentiles and how much of each stage was sleeping"""
+    with _lock:
+        durations: dict[str, list[tuple[float, float]]] = {name: list(runs) for name, runs in _durations.items()}
+    lines: list[str] = [f"  {'stage':<34}{'calls':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'sleep %':>9}"]
+    for name, runs in sorted(durations.items(), key=lambda item: -sum(wall for wall, _ in item[1])):
+        walls: list[float] = sorted(wall * 1000 for wall, _ in runs)
+        total: float = sum(wall for wall, _ in runs)
+        sleep_share: float = sum(sleep for _, sleep in runs) / total * 100 if total else 0.0
+        lines.append(
+            f"  {name:<34}{len(walls):>6}{statistics.median(walls):>10.1f}"
+            f"{walls[max(int(len(walls) * 0.95) - 1, 0)]:>10.1f}{walls[-1]:>10.1f}{sleep_share:>8.0f}%"
+        )
+    return "\n".join(lines)
+
+
+def export() -> dict:
+    """Returns the counters and stage durations in a picklable form, e.g. to send to another process"""
+    with _lock:
+        return {"counters": dict(_counters), "durations": {name: list(runs) for name, runs in _durations.items()}}
+
+
+def merge(exported: dict) -> None:
+    """Adds counters and stage durations exported by another process to this one's"""
+    with _lock:
+        _counters.update(exported["counters"])
+        for name, runs in exported["durations"].items():
+            _durations.setdefault(name, []).extend(runs)
+
+
+def reset() -> None:
+    """Clears everything recorded, called when a new game starts"""
+    with _lock:
+        _counters.clear()
+        _round_stages.clear()
+        _durations.clear()
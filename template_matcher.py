@@ -0,0 +1,121 @@
+"""
+Matches screen crops against a bank of binarized templates using normalized correlation
+Banks are built offline from labelled crops: python template_matcher.py <crop directory> <output .npz>
+Crops are labelled by file name (Ahri.png, Ahri_2.png) or by the name of the folder they are in (Ahri/1.png)
+Text is matched on its binarized glyphs, icons (--color) on their downscaled colors
+"""
+
+import argparse
+from pathlib import Path
+import cv2
+import numpy as np
+
+
+class TemplateBank:
+    """Set of labelled templates stored as unit vectors so a match is a single matrix product"""
+
+    def __init__(self, names: list[str], templates: np.ndarray, size: tuple[int, int], color: bool = False) -> None:
+        self.names: list[str] = names
+        self.templates: np.ndarray = templates
+        self.size: tuple[int, int] = size
+        self.color: bool = color
+
+    @classmethod
+    def empty(cls, size: tuple[int, int], color: bool = False) -> "TemplateBank":
+        """Returns a bank without templates, every match has a score of 0"""
+        return cls([], np.zeros((0, size[0] * size[1] * (3 if color else 1)), dtype=np.float32), size, color)
+
+    @classmethod
+    def load(cls, path: str, size: tuple[int, int], color: bool = False) -> "TemplateBank":
+        """Loads a bank from disk, returning an empty bank if it hasn't been built or can't be read
+        An empty bank matches nothing, so every crop falls back to OCR"""
+        if not Path(path).is_file():
+            return cls.empty(size, color)
+        try:
+            with np.load(path) as data:
+                return cls(np.asarray(data["names"]).tolist(), data["templates"],
+                           tuple(np.asarray(data["size"]).tolist()), bool(data["color"]) if "color" in data else False)
+        except (OSError, ValueError, KeyError) as error:
+            print(f"  [!] Could not load the template bank {path}, using OCR instead: {error}")
+            return cls.empty(size, color)
+
+    def save(self, path: str) -> None:
+        """Writes the bank to disk"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, names=np.array(self.names), templates=self.templates, size=np.array(self.size),
+                            color=np.array(self.color))
+
+    def match_many(self, images: list[np.ndarray]) -> list[tuple[str, float]]:
+        """Returns the best (name, score) for every image, score is the correlation in the range 0-1"""
+        if not self.names or not images:
+            return [("", 0.0)] * len(images)
+        describe = color_descriptor if self.color else descriptor
+        vectors: np.ndarray = np.stack([describe(image, self.size) for image in images])
+        scores: np.ndarray = vectors @ self.templates.T
+        best: np.ndarray = np.argmax(scores, axis=1)
+        return [(self.names[index], min(max(float(scores[row, index]), 0.0), 1.0)) for row, index in enumerate(best)]
+
+    def match(self, image: np.ndarray) -> tuple[str, float]:
+        """Returns the best (name, score) for a single image"""
+        return self.match_many([image])[0]
+
+
+def binarize(image: np.ndarray) -> np.ndarray:
+    """Otsu thresholds a crop so bright glyphs or icon edges become 1 and the background 0"""
+    if image.ndim == 3:
+        image = cv2.cvtColor(np.ascontiguousarray(image[..., :3]), cv2.COLOR_RGB2GRAY)
+    return cv2.threshold(image, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+
+
+def descriptor(image: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+    """Crops a binarized image to its ink, resizes it to size (width, height) and returns it as a unit vector"""
+    binary: np.ndarray = binarize(image)
+    rows: np.ndarray = np.flatnonzero(binary.any(axis=1))
+    columns: np.ndarray = np.flatnonzero(binary.any(axis=0))
+    if rows.size == 0:
+        return np.zeros(size[0] * size[1], dtype=np.float32)
+    binary = binary[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+    vector: np.ndarray = cv2.resize(binary.astype(np.float32), size, interpolation=cv2.INTER_AREA).reshape(-1)
+    vector -= vector.mean()
+    norm: float = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def color_descriptor(image: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+    """Resizes an RGB icon to size (width, height) and returns its zero mean colors as a unit vector"""
+    resized: np.ndarray = cv2.resize(np.ascontiguousarray(image[..., :3]), size, interpolation=cv2.INTER_AREA)
+    vector: np.ndarray = resized.astype(np.float32).reshape(-1)
+    vector -= vector.mean()
+    norm: float = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def build(directory: str, size: tuple[int, int], color: bool = False) -> TemplateBank:
+    """Builds a bank from labelled crops, crops sharing a label are averaged into one template"""
+    describe = color_descriptor if color else descriptor
+    grouped: dict[str, list[np.ndarray]] = {}
+    for path in sorted(Path(directory).rglob("*.png")):
+        label: str = path.parent.name if path.parent != Path(directory) else path.stem.split("_")[0]
+        image: np.ndarray = cv2.cvtColor(cv2.imread(str(path)), cv2.COLOR_BGR2RGB)
+        grouped.setdefault(label, []).append(describe(image, size))
+    if not grouped:
+        return TemplateBank.empty(size, color)
+    templates: list[np.ndarray] = []
+    for vectors in grouped.values():
+        template: np.ndarray = np.mean(vectors, axis=0)
+        norm: float = float(np.linalg.norm(template))
+        templates.append(template / norm if norm else template)
+    return TemplateBank(list(grouped), np.stack(templates).astype(np.float32), size, color)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("crops", help="Directory of labelled .png crops")
+    parser.add_argument("output", help="Path of the .npz bank to write")
+    parser.add_argument("--width", type=int, default=96)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--color", action="store_true", help="Match icons by color instead of binarized text")
+    arguments = parser.parse_args()
+    bank: TemplateBank = build(arguments.crops, (arguments.width, arguments.height), arguments.color)
+    bank.save(arguments.output)
+    print(f"Saved {len(bank.names)} templates to {arguments.output}")
@@ -0,0 +1,61 @@
+"""
+Tests for the shared frame cache
+"""
+
+import numpy as np
+import frame
+import screen_context
+from screen_context import ScreenContext
+
+LEFT_WINDOW: ScreenContext = ScreenContext.for_window(0, 0, 1920, 1080)
+RIGHT_WINDOW: ScreenContext = ScreenContext.for_window(1920, 0, 1280, 720)
+
+
+def fake_screen(coords: tuple) -> np.ndarray:
+    """Screenshot filled with the left edge of the captured area, so each window's frames differ"""
+    return np.full((coords[3] - coords[1], coords[2] - coords[0], 3), coords[0] % 256, dtype=np.uint8)
+
+
+def test_contexts_keep_their_own_frame() -> None:
+    """Switching contexts between two reads never hands one window the other window's frame"""
+    frame.set_screen_source(fake_screen)
+    try:
+        with screen_context.using(LEFT_WINDOW):
+            left: frame.Frame = frame.current()
+        with screen_context.using(RIGHT_WINDOW):
+            right: frame.Frame = frame.current()
+            assert frame.current() is right
+        with screen_context.using(LEFT_WINDOW):
+            assert frame.current() is left
+        assert left.origin == (0, 0) and left.array.shape == (1080, 1920, 3)
+        assert right.origin == (1920, 0) and right.array.shape == (720, 1280, 3)
+    finally:
+        frame.set_screen_source(frame.grab_screen)
+
+
+def test_peek_reads_the_active_context() -> None:
+    """A region peeked in one context comes from that context's frame"""
+    frame.set_screen_source(fake_screen)
+    try:
+        with screen_context.using(RIGHT_WINDOW):
+            frame.current()
+            assert frame.peek((1920, 0, 1930, 10)).shape == (10, 10, 3)
+        with screen_context.using(LEFT_WINDOW):
+            frame.current()
+        with screen_context.using(RIGHT_WINDOW):
+            assert int(frame.peek((1920, 0, 1930, 10))[0, 0, 0]) == 1920 % 256
+    finally:
+        frame.set_screen_source(frame.grab_screen)
+
+
+def test_invalidate_drops_every_context() -> None:
+    """Input sent to the game drops the frames of all contexts"""
+    frame.set_screen_source(fake_screen)
+    try:
+        with screen_context.using(LEFT_WINDOW):
+            left: frame.Frame = frame.current()
+        frame.invalidate()
+        with screen_context.using(LEFT_WINDOW):
+            assert frame.current() is not left
+    finally:
+        frame.set_screen_source(frame.grab_screen)
@@ -0,0 +1,27 @@
+"""
+Tests for the OCR name index
+"""
+
+import game_assets
+from name_matcher import NameIndex
+
+CHAMPIONS = NameIndex(game_assets.CHAMPIONS)
+ITEMS = NameIndex(game_assets.ITEMS)
+
+
+def test_misreads_resolve_at_sequence_matcher_thresholds() -> None:
+    """Misreads the SequenceMatcher scans resolved still resolve with the thresholds they used"""
+    assert ITEMS.match("InfintyEdgve", 0.85, allow_substring=True)[0] == "InfinityEdge"
+    assert ITEMS.match("RecrveBoFw", 0.85, allow_substring=True)[0] == "RecurveBow"
+    assert CHAMPIONS.match("Irel", 0.7)[0] == "Irelia"
+
+
+def test_short_misreads_without_shared_trigrams() -> None:
+    """Short names can be matched even when the misread shares no trigram with them"""
+    assert CHAMPIONS.match("Jx", 0.7)[0] == "Jax"
+
+
+def test_unrelated_text_is_unresolved() -> None:
+    """Text that isn't close to any name returns no match"""
+    assert CHAMPIONS.match("qqqqqqqq", 0.7) == (None, 0.0)
+    assert ITEMS.match("", 0.85) == (None, 0.0)
@@ -0,0 +1,53 @@
+"""
+Tests for finding loot orbs on the board and noticing when one is picked up
+"""
+
+import cv2
+import numpy as np
+import frame
+import orb_pickup
+import screen_context
+from screen_context import ScreenContext
+
+SCREEN: ScreenContext = ScreenContext.for_window(0, 0, 400, 200)
+BOARD: tuple[int, int, int] = (60, 90, 70)
+GRAY_ORB: tuple[int, int, int] = (225, 225, 230)
+WHITE: tuple[int, int, int] = (255, 255, 255)
+
+
+def board(orbs: list[tuple[int, int]]) -> np.ndarray:
+    """A dark board with white UI, a bar, a box and text, and gray orbs at the centers passed in"""
+    image: np.ndarray = np.full((200, 400, 3), BOARD, dtype=np.uint8)
+    cv2.rectangle(image, (20, 20), (55, 55), WHITE, -1)
+    cv2.rectangle(image, (100, 160), (220, 180), WHITE, -1)
+    cv2.putText(image, "OOO", (240, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.5, WHITE, 4)
+    for center in orbs:
+        cv2.circle(image, center, 20, GRAY_ORB, -1)
+    return image
+
+
+def test_white_ui_is_not_an_orb() -> None:
+    """Only the round gray orbs are found, white boxes, bars and letters are left alone"""
+    orbs: list[tuple[float, float]] = orb_pickup.detect_orbs(board([(150, 80), (330, 140)]))
+    assert len(orbs) == 2
+    for found, center in zip(sorted(orbs), [(150, 80), (330, 140)]):
+        assert abs(found[0] - center[0]) <= 2 and abs(found[1] - center[1]) <= 2
+    assert not orb_pickup.detect_orbs(board([]))
+
+
+def test_orb_collected_waits_for_the_orb_to_go() -> None:
+    """The predicate stays false while the orb is in its box, whatever else changes around it"""
+    screens: list[np.ndarray] = [board([(150, 80)])]
+    frame.set_screen_source(lambda coords: screens[-1][coords[1]:coords[3], coords[0]:coords[2]])
+    try:
+        with screen_context.using(SCREEN):
+            collected = orb_pickup.orb_collected((150, 80))
+            assert not collected()
+            screens.append(board([(150, 80), (330, 140)]))
+            frame.invalidate()
+            assert not collected()
+            screens.append(board([]))
+            frame.invalidate()
+            assert collected()
+    finally:
+        frame.set_screen_source(frame.grab_screen)
@@ -0,0 +1,62 @@
+"""
+Tests for the round label watcher
+"""
+
+import cv2
+import numpy as np
+import digit_reader
+import frame
+from round_watcher import RoundWatcher
+
+ROUNDS: list[str] = [f"{stage}-{round_number}" for stage in range(1, 8) for round_number in range(1, 8)]
+
+
+def render_label(text: str, noise: int = 0, seed: int = 0) -> np.ndarray:
+    """Draws a round label into a ROUND_POS sized strip over a textured background"""
+    strip: np.ndarray = np.full((24, 117, 3), (20, 30, 40), dtype=np.uint8)
+    strip += (np.arange(117) // 3).astype(np.uint8)[None, :, None]
+    cv2.putText(strip, text, (73, 18), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (230, 230, 220), 1, cv2.LINE_AA)
+    if noise:
+        jitter: np.ndarray = np.random.default_rng(seed).integers(-noise, noise + 1, strip.shape)
+        strip = np.clip(strip.astype(int) + jitter, 0, 255).astype(np.uint8)
+    return strip
+
+
+def test_consecutive_rounds_change_the_label() -> None:
+    """Every round is told apart from the one before it, a single changed digit is enough"""
+    watcher = RoundWatcher(lambda layout: ["0-0", 0])
+    for previous, current in zip(ROUNDS, ROUNDS[1:]):
+        watcher.label = digit_reader.binarize_digits(render_label(previous))
+        assert watcher.label_changed(digit_reader.binarize_digits(render_label(current))), (previous, current)
+
+
+def test_flicker_does_not_change_the_label() -> None:
+    """Capture noise on the same round doesn't count as a change"""
+    watcher = RoundWatcher(lambda layout: ["0-0", 0])
+    for seed, game_round in enumerate(ROUNDS):
+        watcher.label = digit_reader.binarize_digits(render_label(game_round))
+        assert not watcher.label_changed(digit_reader.binarize_digits(render_label(game_round, 8, seed)))
+
+
+def test_poll_decodes_only_new_labels() -> None:
+    """poll decodes each new label once and reports the round change"""
+    shown: list[str] = ["2-1"]
+    decoded: list[int] = []
+
+    def decode(layout: int) -> list:
+        decoded.append(layout)
+        return [shown[0], 3]
+
+    frame.set_screen_source(lambda coords: render_label(shown[0]))
+    try:
+        watcher = RoundWatcher(decode)
+        assert watcher.poll().current == ["2-1", 3]
+        frame.invalidate()
+        assert watcher.poll() is None
+        shown[0] = "2-2"
+        frame.invalidate()
+        change = watcher.poll()
+        assert change.previous == ["2-1", 3] and change.current == ["2-2", 3]
+        assert len(decoded) == 2
+    finally:
+        frame.set_screen_source(frame.grab_screen)
@@ -0,0 +1,31 @@
+"""
+Tests for the shop value table
+"""
+
+import comps
+from shop_engine import ShopEngine
+
+
+def champion(board_position: int, level: int = 2, final_comp: bool = True) -> dict:
+    """Comp entry with the fields the value table reads"""
+    return {"board_position": board_position, "items": [], "level": level, "final_comp": final_comp}
+
+
+def test_front_row_ranks_above_back_row() -> None:
+    """Of two otherwise equal champions the one in the front row is worth more, whatever the comp order"""
+    engine = ShopEngine({"Irelia": champion(0), "Wukong": champion(22)})
+    assert engine.values["Wukong"] > engine.values["Irelia"]
+
+
+def test_row_does_not_outweigh_level() -> None:
+    """A back row three star target is still worth more than a front row two star one"""
+    engine = ShopEngine({"Diana": champion(26), "Tristana": champion(6, level=3)})
+    assert engine.values["Tristana"] > engine.values["Diana"]
+
+
+def test_default_comp_ranking() -> None:
+    """Front row Volibear outranks back row Tristana in the default comp, both are three star carries"""
+    engine = ShopEngine(comps.COMP)
+    assert comps.COMP["Volibear"]["board_position"] >= 21 > comps.COMP["Tristana"]["board_position"]
+    assert engine.values["Volibear"] > engine.values["Tristana"]
+    assert engine.values["Wukong"] > engine.values["Irelia"]
@@ -0,0 +1,26 @@
+"""
+Tests for loading template banks
+"""
+
+from pathlib import Path
+import numpy as np
+from template_matcher import TemplateBank
+
+
+def test_missing_and_corrupt_banks_load_empty(tmp_path: Path) -> None:
+    """A bank that is missing, corrupt or lacks arrays loads as an empty bank instead of raising"""
+    corrupt: Path = tmp_path / "corrupt.npz"
+    corrupt.write_text("not a bank", encoding="utf-8")
+    incomplete: Path = tmp_path / "incomplete.npz"
+    np.savez(incomplete, names=np.array(["Ahri"]))
+    for path in (tmp_path / "missing.npz", corrupt, incomplete):
+        bank: TemplateBank = TemplateBank.load(str(path), (16, 16), color=True)
+        assert not bank.names and bank.templates.shape == (0, 16 * 16 * 3)
+
+
+def test_saved_bank_round_trips(tmp_path: Path) -> None:
+    """A saved bank loads back with the same names, size and color mode"""
+    path: Path = tmp_path / "bank.npz"
+    TemplateBank(["Ahri", "Jax"], np.eye(2, 4, dtype=np.float32), (2, 2), color=False).save(str(path))
+    bank: TemplateBank = TemplateBank.load(str(path), (2, 2))
+    assert bank.names == ["Ahri", "Jax"] and bank.size == (2, 2) and not bank.color
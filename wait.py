@@ -0,0 +1,77 @@
+"""
+Condition based waits that poll a cheap screen predicate instead of sleeping for the worst case
+Region predicates take (x, y, x+w, y+h) screen coordinates and capture their baseline when they are created,
+so create them before sending the input that should change the screen
+"""
+
+from typing import Callable
+import numpy as np
+from clock import sleep, perf_counter
+import frame
+import settings
+
+
+def until(predicate: Callable[[], bool], timeout: float, interval: float = 0.05, backoff: float = 1.5,
+          max_interval: float = 0.25) -> bool:
+    """Polls the predicate until it is true or the timeout passes, returns whether it became true"""
+    deadline: float = perf_counter() + timeout
+    while True:
+        if predicate():
+            return True
+        remaining: float = deadline - perf_counter()
+        if remaining <= 0:
+            return False
+        sleep(min(interval, remaining))
+        interval = min(interval * backoff, max_interval)
+
+
+def region_hash(coords: tuple) -> np.ndarray:
+    """Perceptual hash of a screen region"""
+    return frame.difference_hash(frame.peek(coords))
+
+
+def hashes_differ(first: np.ndarray, second: np.ndarray) -> bool:
+    """Checks if two region hashes differ by more than the flicker tolerance"""
+    return np.count_nonzero(first != second) > settings.REGION_HASH_TOLERANCE
+
+
+def region_changed(coords: tuple) -> Callable[[], bool]:
+    """Predicate that becomes true once the region looks different from when the predicate was created"""
+    baseline: np.ndarray = region_hash(coords)
+    return lambda: hashes_differ(region_hash(coords), baseline)
+
+
+def region_stable(coords: tuple, polls: int = 2) -> Callable[[], bool]:
+    """Predicate that becomes true once the region stays the same for the number of polls passed in"""
+    state: dict = {"hash": region_hash(coords), "unchanged": 0}
+
+    def predicate() -> bool:
+        current: np.ndarray = region_hash(coords)
+        state["unchanged"] = 0 if hashes_differ(current, state["hash"]) else state["unchanged"] + 1
+        state["hash"] = current
+        return state["unchanged"] >= polls
+    return predicate
+
+
+def region_settled(coords: tuple, polls: int = 2) -> Callable[[], bool]:
+    """Predicate that becomes true once the region has changed and then stopped changing, e.g. an animation ended"""
+    baseline: np.ndarray = region_hash(coords)
+    state: dict = {"hash": baseline, "changed": False, "unchanged": 0}
+
+    def predicate() -> bool:
+        current: np.ndarray = region_hash(coords)
+        state["changed"] = state["changed"] or hashes_differ(current, baseline)
+        state["unchanged"] = 0 if hashes_differ(current, state["hash"]) else state["unchanged"] + 1
+        state["hash"] = current
+        return state["changed"] and state["unchanged"] >= polls
+    return predicate
+
+
+def any_of(*predicates: Callable[[], bool]) -> Callable[[], bool]:
+    """Predicate that is true once any of the predicates passed in is"""
+    return lambda: any(predicate() for predicate in predicates)
+
+
+def around(coords: tuple, radius: int) -> tuple:
+    """Returns the (x, y, x+w, y+h) box around an (x, y) point"""
+    return (coords[0] - radius, coords[1] - radius, coords[0] + radius, coords[1] + radius)